@@ -0,0 +1,78 @@
+"""
+Compares `Crossandra(case_insensitive=True)` with listing every case variant
+of each keyword as a tuple value in the enum.
+
+    $ python benchmarks/case_insensitive.py
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+import tracemalloc
+from enum import Enum
+from typing import Any
+
+from crossandra import Crossandra, common
+from crossandra.lib import case_tables
+
+KEYWORDS = (
+    "select",
+    "from",
+    "where",
+    "group",
+    "order",
+    "having",
+    "distinct",
+    "between",
+    "insert",
+    "update",
+    "delete",
+    "values",
+)
+SOURCE = (
+    "SELECT DISTINCT name FROM users WHERE age BETWEEN 18 AND 30 "
+    "Group By name Having count ORDER by name "
+) * 2000
+
+
+def variants(keyword: str) -> tuple[str, ...]:
+    return tuple(map("".join, itertools.product(*({c, c.upper()} for c in keyword))))
+
+
+def build(*, expanded: bool) -> tuple[Crossandra, float, int]:
+    """Returns a tokenizer, its construction time, and its memory usage."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    values: dict[str, Any] = {
+        k.upper(): variants(k) if expanded else k for k in KEYWORDS
+    }
+    keyword: type[Enum] = Enum("Keyword", values)  # type: ignore[misc]
+    tokenizer = Crossandra(
+        keyword,
+        rules=[common.C_NAME, common.INT],
+        ignore_whitespace=True,
+        case_insensitive=not expanded,
+    )
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return tokenizer, elapsed, size
+
+
+def main() -> None:
+    case_tables()  # Built once per process, excluded from the comparison
+    print("approach         | build    | memory    | tokenize")
+    for name, expanded in (("tuple expansion", True), ("case_insensitive", False)):
+        tokenizer, elapsed, size = build(expanded=expanded)
+        start = time.perf_counter()
+        tokenizer.tokenize(SOURCE)
+        tokenize = time.perf_counter() - start
+        print(
+            f"{name:<16} | {elapsed * 1000:6.1f}ms | {size / 1024:7.1f}KiB"
+            f" | {tokenize:6.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
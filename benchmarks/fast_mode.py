@@ -0,0 +1,47 @@
+"""
+Measures Fast Mode (single-character tokens, no rules) on a large input, with
+and without positions, and with unknown characters suppressed.
+
+    $ python benchmarks/fast_mode.py
+"""
+
+from __future__ import annotations
+
+import time
+from enum import Enum
+
+from crossandra import Crossandra
+
+SIZE = 2_000_000
+
+
+class Brainfuck(Enum):
+    ADD = "+"
+    SUB = "-"
+    LEFT = "<"
+    RIGHT = ">"
+    READ = ","
+    WRITE = "."
+    BEGIN_LOOP = "["
+    END_LOOP = "]"
+
+
+def main() -> None:
+    program = ("++++++++[>++++[>++>+++<<-]>+<<-]>>.>---.+++++++..\n" * SIZE)[:SIZE]
+    commented = ("print a letter: [>+<-]>. then the next one: +.\n" * SIZE)[:SIZE]
+    tokenizer = Crossandra(Brainfuck, ignore_whitespace=True)
+    suppressing = Crossandra(Brainfuck, suppress_unknown=True)
+    print(f"{SIZE // 1_000_000}M characters          | time")
+    for name, t, source, with_positions in (
+        ("tokens", tokenizer, program, False),
+        ("tokens and positions", tokenizer, program, True),
+        ("unknowns suppressed", suppressing, commented, False),
+        ("... with positions", suppressing, commented, True),
+    ):
+        start = time.perf_counter()
+        t.tokenize(source, with_positions=with_positions)
+        print(f"{name:<24} | {time.perf_counter() - start:6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
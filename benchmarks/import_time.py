@@ -0,0 +1,51 @@
+"""
+Measures how long importing crossandra takes, using `python -X importtime`
+in fresh interpreters.
+
+    $ python benchmarks/import_time.py
+
+Bytecode must be cached (i.e. `PYTHONDONTWRITEBYTECODE` unset), as compiling
+the sources would otherwise make up most of the measured time.
+"""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+
+RUNS = 20
+STATEMENTS = (
+    "import crossandra",
+    "from crossandra import common",
+    "from crossandra import TokenCache",
+)
+
+
+def measure(statement: str) -> float:
+    """Returns the cumulative import time of `statement` in milliseconds."""
+    stderr = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr
+    total = 0
+    for line in stderr.splitlines():
+        # Only top level imports, nested ones are included in their parents
+        _, cumulative, name = line.split("|")
+        if name.startswith(" ") and not name.startswith("  "):
+            total += int(cumulative) if cumulative.strip().isdigit() else 0
+    return total / 1000
+
+
+def main() -> None:
+    baseline = statistics.median(measure("pass") for _ in range(RUNS))
+    print(f"median of {RUNS} runs, interpreter startup excluded")
+    for statement in STATEMENTS:
+        median = statistics.median(measure(statement) for _ in range(RUNS))
+        print(f"{statement:<34} | {median - baseline:6.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measures building many tokenizers with the same enum, which share their
+compiled state, against building them with equal but distinct enums, which
+can't.
+
+    $ python benchmarks/registry.py
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from enum import Enum
+from typing import Any
+
+from crossandra import Crossandra, common
+
+TOKENIZERS = 200
+VALUES = {f"KEYWORD_{i}": f"kw{i}" for i in range(2000)}
+
+
+def make_enum() -> type[Enum]:
+    keyword: type[Enum] = Enum("Keyword", VALUES)  # type: ignore[misc]
+    return keyword
+
+
+def build(enums: list[type[Enum]]) -> tuple[list[Crossandra], float, int]:
+    """Returns the tokenizers, their construction time, and memory usage."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rules: list[Any] = [common.C_NAME, common.INT]
+    tokenizers = [
+        Crossandra(enum, rules=rules, ignore_whitespace=True) for enum in enums
+    ]
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return tokenizers, elapsed, size
+
+
+def main() -> None:
+    shared = make_enum()
+    print(f"{TOKENIZERS} tokenizers | build    | memory")
+    for name, enums in (
+        ("distinct enums", [make_enum() for _ in range(TOKENIZERS)]),
+        ("same enum", [shared] * TOKENIZERS),
+    ):
+        _, elapsed, size = build(enums)
+        print(f"{name:<16} | {elapsed * 1000:6.1f}ms | {size / 1024**2:6.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
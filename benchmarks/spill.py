@@ -0,0 +1,68 @@
+"""
+Compares the peak memory used by `Crossandra.tokenize` and by
+`Crossandra.tokenize_into` writing to a `FileSink`, for memory-mapped inputs
+of growing sizes.
+
+    $ python benchmarks/spill.py
+"""
+
+from __future__ import annotations
+
+import mmap
+import tempfile
+import tracemalloc
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from crossandra import Crossandra, FileSink, common
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class Op(Enum):
+    ADD = "+"
+    MUL = "*"
+    ASSIGN = "="
+
+
+LINE = b"total = alpha * 12 + beta * 345\n"
+TOKENIZER = Crossandra(
+    Op, rules=[common.INT, common.C_NAME], ignore_whitespace=True, convert_crlf=False
+)
+
+
+def peak(function: Callable[[], Any]) -> float:
+    """Returns the peak memory allocated by `function` in MiB."""
+    tracemalloc.start()
+    function()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size / 2**20
+
+
+def main() -> None:
+    print("input size | tokenize  | tokenize_into")
+    with tempfile.TemporaryDirectory() as directory:
+        source, out = Path(directory) / "source", Path(directory) / "tokens"
+        for lines in (10_000, 100_000, 1_000_000):
+            source.write_bytes(LINE * lines)
+            with (
+                source.open("rb") as f,
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m,
+                memoryview(m) as view,
+                out.open("wb") as sink_file,
+            ):
+                listed = peak(lambda: TOKENIZER.tokenize(view))
+                spilled = peak(
+                    lambda: TOKENIZER.tokenize_into(
+                        view, FileSink(sink_file, TOKENIZER)
+                    )
+                )
+            size = len(LINE) * lines / 2**20
+            print(f"{size:6.1f} MiB | {listed:5.1f} MiB | {spilled:5.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
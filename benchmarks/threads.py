@@ -0,0 +1,50 @@
+"""
+Measures how `Crossandra.tokenize_many` scales with the number of threads.
+
+Run with both a regular and a free-threaded interpreter to compare:
+    $ python benchmarks/threads.py
+    $ python3.14t benchmarks/threads.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from enum import Enum
+
+from crossandra import Crossandra, common
+
+
+class Op(Enum):
+    ADD = "+"
+    SUB = "-"
+    MUL = "*"
+    DIV = "/"
+    POW = "**"
+    LPAREN = "("
+    RPAREN = ")"
+
+
+SOURCE = "(alpha + 2.5) ** beta - 10 / (gamma * 3) " * 500
+SOURCES = [SOURCE] * 64
+THREADS = (1, 2, 4, 8)
+
+
+def main() -> None:
+    tokenizer = Crossandra(
+        Op, rules=[common.NUMBER, common.C_NAME], ignore_whitespace=True
+    )
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    print("threads | time    | speedup")
+    baseline = 0.0
+    for n in THREADS:
+        start = time.perf_counter()
+        tokenizer.tokenize_many(SOURCES, max_workers=n)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{n:<7} | {elapsed:6.3f}s | {baseline / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measures the memory used per token by the different output modes of
+`Crossandra.tokenize`, compared with building `(kind, value, start, end)`
+tuples from `Crossandra.scan`.
+
+    $ python benchmarks/token_memory.py
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+from crossandra import Crossandra, common
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class Op(Enum):
+    ADD = "+"
+    MUL = "*"
+    LPAREN = "("
+    RPAREN = ")"
+
+
+SOURCE = "(alpha + beta) * gamma + delta " * 10_000
+TOKENIZER = Crossandra(Op, rules=[common.C_NAME], ignore_whitespace=True)
+
+
+def as_tuples() -> list[tuple[Any, ...]]:
+    rules = set(TOKENIZER.kinds[len(Op) :])
+    return [
+        (
+            kind,
+            SOURCE[start : start + length] if kind in rules else kind,
+            start,
+            start + length,
+        )
+        for start, length, kind in TOKENIZER.scan(SOURCE)
+    ]
+
+
+def measure(produce: Callable[[], list[Any]]) -> float:
+    """Returns the memory used by the produced list per token, in bytes."""
+    tracemalloc.start()
+    tokens = produce()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(tokens)
+
+
+def main() -> None:
+    cases: dict[str, Callable[[], list[Any]]] = {
+        'output="values"': lambda: TOKENIZER.tokenize(SOURCE),
+        "with_positions=True": lambda: TOKENIZER.tokenize(SOURCE, with_positions=True),
+        'output="tokens"': lambda: TOKENIZER.tokenize(SOURCE, output="tokens"),
+        "4-tuples from scan": as_tuples,
+    }
+    print("output              | bytes per token")
+    for name, produce in cases.items():
+        print(f"{name:<19} | {measure(produce):6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measures the overhead of tracing on `Crossandra.tokenize`, with no tracer
+installed, with a tracer receiving start and end events only, and with every
+100th token sampled.
+
+    $ python benchmarks/tracing.py
+"""
+
+from __future__ import annotations
+
+import timeit
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from crossandra import Crossandra, common, set_tracer
+
+if TYPE_CHECKING:
+    from crossandra.lib import Kind
+
+SOURCES = {
+    "small": "x = 2 ** 10 + y",
+    "large": "x = 2 ** 10 + y\n" * 10_000,
+}
+
+
+class Op(Enum):
+    ASSIGN = "="
+    ADD = "+"
+    POW = "**"
+
+
+class Counters:
+    """A tracer accumulating totals, as a metrics exporter would."""
+
+    def __init__(self) -> None:
+        self.calls = self.size = self.tokens = 0
+        self.seconds = 0.0
+        self.sampled: dict[Kind, float] = {}
+
+    def start(self, *_: object) -> None:
+        pass
+
+    def end(
+        self, _tokenizer: Crossandra, size: int, count: int, elapsed: float, /
+    ) -> None:
+        self.calls += 1
+        self.size += size
+        self.tokens += count
+        self.seconds += elapsed
+
+    def token(
+        self,
+        _tokenizer: Crossandra,
+        kind: Kind,
+        _start: int,
+        _length: int,
+        elapsed: float,
+        /,
+    ) -> None:
+        self.sampled[kind] = self.sampled.get(kind, 0.0) + elapsed
+
+
+def main() -> None:
+    tokenizer = Crossandra(
+        Op, rules=[common.INT, common.C_NAME], ignore_whitespace=True
+    )
+    print("input | no tracer   | start/end   | sampled")
+    for name, source in SOURCES.items():
+        number = 20_000 if name == "small" else 5
+        times = []
+        for sample_every in (None, 0, 100):
+            if sample_every is not None:
+                set_tracer(Counters(), sample_every=sample_every)
+            best = min(
+                timeit.repeat(
+                    lambda: tokenizer.tokenize(source),  # noqa: B023
+                    number=number,
+                    repeat=5,
+                )
+            )
+            times.append(best / number)
+            set_tracer(None)
+        print(f"{name:<5} | " + " | ".join(f"{t * 1e6:9.1f}µs" for t in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,89 @@
-from . import common
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .exceptions import (
     CrossandraError,
+    CrossandraIndentationError,
     CrossandraTokenizationError,
     CrossandraValueError,
 )
 from .lib import Crossandra
-from .rule import IGNORED, NOT_APPLIED, Ignored, NotApplied, Rule, RuleGroup
+from .rule import (
+    IGNORED,
+    NOT_APPLIED,
+    Ignored,
+    NotApplied,
+    PatternIssue,
+    Rule,
+    RuleGroup,
+)
+from .token import InvalidSpan, LazyValue, Token
+from .tracing import Tracer, get_tracer, set_tracer
+
+if TYPE_CHECKING:
+    from . import common
+    from .cache import TokenCache
+    from .pipeline import Filter, Indent, Map, Pipeline
+    from .sink import ArraySink, CallbackSink, FileSink, Sink, TokenFile
+    from .stream import FollowState, StreamState
 
 __all__ = (
     "IGNORED",
     "NOT_APPLIED",
+    "ArraySink",
+    "CallbackSink",
     "Crossandra",
     "CrossandraError",
+    "CrossandraIndentationError",
     "CrossandraTokenizationError",
     "CrossandraValueError",
+    "FileSink",
+    "Filter",
+    "FollowState",
     "Ignored",
+    "Indent",
+    "InvalidSpan",
+    "LazyValue",
+    "Map",
     "NotApplied",
+    "PatternIssue",
+    "Pipeline",
     "Rule",
     "RuleGroup",
+    "Sink",
+    "StreamState",
+    "Token",
+    "TokenCache",
+    "TokenFile",
+    "Tracer",
     "common",
+    "get_tracer",
+    "set_tracer",
 )
+
+
+# Submodules (and the names they define) loaded on first access to keep
+# `import crossandra` fast
+LAZY = {
+    "common": ".common",
+    "TokenCache": ".cache",
+    "ArraySink": ".sink",
+    "CallbackSink": ".sink",
+    "FileSink": ".sink",
+    "Sink": ".sink",
+    "TokenFile": ".sink",
+    "Filter": ".pipeline",
+    "Indent": ".pipeline",
+    "Map": ".pipeline",
+    "Pipeline": ".pipeline",
+    "FollowState": ".stream",
+    "StreamState": ".stream",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if (module := LAZY.get(name)) is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    loaded = import_module(module, __name__)
+    return loaded if name == "common" else getattr(loaded, name)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, final
+
+from .stream import StreamState
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Callable
+    from concurrent.futures import Executor
+
+# This module is not compiled with mypyc, as the compiled `__anext__` can
+# segfault
+
+
+@final
+class AsyncTokenIterator:
+    """
+    An asynchronous iterator over tokens read from an `asyncio.StreamReader`
+    (see `Crossandra.atokenize`).
+    """
+
+    __slots__ = (
+        "__chunk_size",
+        "__done",
+        "__executor",
+        "__feed",
+        "__index",
+        "__reader",
+        "__state",
+        "__tokens",
+    )
+
+    def __init__(
+        self,
+        feed: Callable[[bytes, StreamState], tuple[list[Any], StreamState]],
+        reader: asyncio.StreamReader,
+        chunk_size: int,
+        executor: Executor | None,
+    ) -> None:
+        self.__feed = feed
+        self.__reader = reader
+        self.__chunk_size = chunk_size
+        self.__executor = executor
+        self.__state = StreamState(carry=b"")
+        self.__tokens: list[Any] = []
+        self.__index = 0
+        self.__done = False
+
+    def __aiter__(self) -> AsyncTokenIterator:
+        return self
+
+    async def __anext__(self) -> Any:
+        while self.__index == len(self.__tokens):
+            if self.__done:
+                raise StopAsyncIteration
+            chunk = await self.__reader.read(self.__chunk_size)
+            self.__done = not chunk
+            if self.__executor is None:
+                tokens, state = self.__feed(chunk, self.__state)
+            else:
+                # Only imported here, as asyncio is slow to import and callers
+                # have necessarily imported it already
+                import asyncio
+
+                tokens, state = await asyncio.get_running_loop().run_in_executor(
+                    self.__executor, self.__feed, chunk, self.__state
+                )
+            self.__tokens, self.__state, self.__index = tokens, state, 0
+        token = self.__tokens[self.__index]
+        self.__index += 1
+        return token
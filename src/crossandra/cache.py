@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+from array import array
+from hashlib import blake2b
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, final
+
+from .lib import check_output, kind_indices
+
+if TYPE_CHECKING:
+    from .lib import Crossandra, Kind, Output, Source
+
+FORMAT_VERSION = 1
+SUFFIX = ".tok"
+# Eviction frees space down to this fraction of `max_size`, so that the
+# directory is only scanned again after that much more has been stored
+LOW_WATER = 0.75
+
+
+@final
+class TokenCache:
+    """
+    An on-disk token cache for a Crossandra tokenizer. Takes the following
+    arguments:
+    - `tokenizer`: the tokenizer to cache the results of
+    - `directory`: the directory to store cached results in (created if
+      missing, can be shared between tokenizers and processes)
+    - `max_size`: the maximum total size of cached results in bytes (defaults
+      to 64 MiB); once exceeded, least recently used results are evicted
+      until they take up at most 3/4 of it
+
+    Results are keyed by the tokenizer's fingerprint and a hash of the input
+    string, and stored as `(kind, start, length)` records. Rule converters are
+    applied when results are loaded.
+    """
+
+    __slots__ = (
+        "__directory",
+        "__kinds",
+        "__max_size",
+        "__prefix",
+        "__size",
+        "__tokenizer",
+    )
+
+    def __init__(
+        self,
+        tokenizer: Crossandra,
+        directory: str | os.PathLike[str],
+        *,
+        max_size: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.__tokenizer = tokenizer
+        self.__directory = Path(directory)
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        self.__max_size = max_size
+        self.__kinds = tokenizer.kinds
+        self.__prefix = f"{tokenizer.fingerprint[:32]}-{FORMAT_VERSION}-"
+        # Total size of the directory's results as of the last scan, plus
+        # what has been stored since (None until the first store)
+        self.__size: int | None = None
+
+    def tokenize(
+        self,
+        code: Source,
+        *,
+        decode: bool = False,
+        output: Output = "values",
+        with_positions: bool = False,
+    ) -> list[Any] | list[tuple[int, Any]]:
+        """
+        Tokenizes the input string like `Crossandra.tokenize`, reusing the
+        cached result when the same input string was tokenized before.
+        """
+        check_output(output)
+        path = self.__path(code)
+        spans = self.__load(path)
+        if spans is None:
+            spans = list(self.__tokenizer.scan(code))
+            self.__store(path, spans)
+        return self.__tokenizer.assemble(
+            code, spans, decode=decode, output=output, with_positions=with_positions
+        )
+
+    def clear(self) -> None:
+        """
+        Removes all cached results from the cache directory, except those
+        open in other processes on Windows.
+        """
+        self.__size = 0
+        for entry in os.scandir(self.__directory):
+            if entry.name.endswith(SUFFIX):
+                # Another process may have already removed the file
+                try:
+                    Path(entry.path).unlink(missing_ok=True)
+                except PermissionError:
+                    self.__size = None  # Rescanned on the next store
+
+    def __path(self, code: Source) -> Path:
+        # Offsets differ between str and bytes inputs, so they're kept apart
+        if isinstance(code, str):
+            kind, digest = "s", blake2b(code.encode("utf-8", "surrogatepass"))
+        else:
+            kind, digest = "b", blake2b(code)
+        name = f"{self.__prefix}{kind}{digest.hexdigest()[:32]}{SUFFIX}"
+        return self.__directory / name
+
+    def __load(self, path: Path) -> list[tuple[int, int, Kind]] | None:
+        try:
+            with path.open("rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if not size:
+                    records: list[int] = []
+                else:
+                    with (
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m,
+                        memoryview(m).cast("I") as view,
+                    ):
+                        records = view.tolist()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        kinds = self.__kinds
+        return [
+            (records[i + 1], records[i + 2], kinds[records[i]])
+            for i in range(0, len(records), 3)
+        ]
+
+    def __store(self, path: Path, spans: list[tuple[int, int, Kind]]) -> None:
+        indices = kind_indices(self.__kinds)
+        try:
+            records = array("I")
+            for start, length, kind in spans:
+                records.extend((indices[kind], start, length))
+        except OverflowError:
+            return  # inputs over 4 GiB are not cached
+        # Written to a temporary file first so that other processes never see
+        # a partially written result
+        fd, tmp = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                records.tofile(f)
+            Path(tmp).replace(path)
+        except PermissionError:
+            # On Windows, entries can't be replaced while another process has
+            # them open, so the result just isn't cached
+            Path(tmp).unlink(missing_ok=True)
+            return
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        if self.__size is None:
+            self.__evict()
+        else:
+            self.__size += len(records) * records.itemsize
+            if self.__size > self.__max_size:
+                self.__evict()
+
+    def __evict(self) -> None:
+        # Also accounts for results stored by other caches sharing the
+        # directory since the last scan
+        entries: list[tuple[float, int, str]] = []
+        total = 0
+        for entry in os.scandir(self.__directory):
+            if not entry.name.endswith(SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        if total > self.__max_size:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.__max_size * LOW_WATER:
+                    break
+                try:
+                    Path(path).unlink(missing_ok=True)
+                except PermissionError:
+                    continue  # Open in another process (on Windows)
+                total -= size
+        self.__size = total
@@ -3,8 +3,41 @@ class CrossandraError(Exception):
 
 
 class CrossandraTokenizationError(CrossandraError):
-    """Unhandled invalid token during tokenization."""
+    """
+    Unhandled invalid token during tokenization. `token` is the first unknown
+    character and `offset` is its position in the input. For compatibility, it
+    can also be raised with just a message, in which case `offset` is None.
+    """
+
+    def __init__(
+        self, token: str | bytes | None = None, offset: int | None = None
+    ) -> None:
+        super().__init__(*(arg for arg in (token, offset) if arg is not None))
+        self.token = token
+        self.offset = offset
+
+    def __str__(self) -> str:
+        if self.offset is None:
+            return super().__str__()
+        return f"invalid token: {self.token!r} (at position {self.offset})"
 
 
 class CrossandraValueError(CrossandraError):
     """An invalid value was used when creating a tokenizer."""
+
+
+class CrossandraIndentationError(CrossandraError):
+    """
+    A line was dedented to a level not matching any enclosing indentation
+    level. `offset` is the position of the line's first token.
+    """
+
+    def __init__(self, offset: int) -> None:
+        super().__init__(offset)
+        self.offset = offset
+
+    def __str__(self) -> str:
+        return (
+            "unindent does not match any outer indentation level "
+            f"(at position {self.offset})"
+        )
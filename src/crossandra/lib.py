@@ -1,15 +1,163 @@
 from __future__ import annotations
 
+import re
+from collections import Counter
 from enum import Enum
-from typing import TYPE_CHECKING, Any, TypeAlias, cast, final
+from functools import cache, partial
+from itertools import islice
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Literal, TypeAlias, cast, final
 
-from result import Err, Ok, Result
-
-from .exceptions import CrossandraTokenizationError
-from .rule import Ignored, NotApplied, Rule, RuleGroup
+from . import tracing
+from .exceptions import CrossandraTokenizationError, CrossandraValueError
+from .patterns import (
+    can_start,
+    can_start_bytes,
+    first_chars,
+    has_assertions,
+    raise_issues,
+)
+from .registry import ENUM_CORES, RULE_DISPATCHES, EnumCore, RuleDispatch, intern
+from .rule import NotApplied, PatternIssue, Rule, RuleGroup
+from .token import InvalidSpan, LazyValue, Token
+from .tracing import sample_spans
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    import asyncio
+    import os
+    from collections.abc import Generator, Iterable, Iterator
+    from concurrent.futures import Executor
+
+    from .aio import AsyncTokenIterator
+    from .sink import Sink
+    from .stream import FollowState, StreamState
+    from .tracing import Tracer
+
+Output: TypeAlias = Literal["values", "lazy", "kinds", "tokens"]
+OUTPUTS = ("values", "lazy", "kinds", "tokens")
+Kind: TypeAlias = "Enum | Rule[Any]"
+Source: TypeAlias = "str | bytes | bytearray | memoryview"
+# The enum's tree, single-byte lookup table (Fast Mode only), and depth
+BytesTables: TypeAlias = "tuple[Tree, list[Enum | None] | None, int]"
+# Fast Mode tables: one deleting skipped characters with `str.translate`, and
+# one mapping characters to their tokens (or to None if they're skipped)
+FastTables: TypeAlias = "tuple[dict[int, None], dict[str, Enum | None]]"
+CRLF = re.compile(rb"\r\n")
+
+
+def check_output(output: str) -> None:
+    if output not in OUTPUTS:
+        msg = f"invalid output: {output!r}"
+        raise CrossandraValueError(msg)
+
+
+def assemble(
+    code: str,
+    spans: Iterable[tuple[int, int, Kind]],
+    *,
+    offset: int = 0,
+    output: Output,
+    with_positions: bool,
+) -> list[Any]:
+    if output == "tokens":
+        return list(iter_tokens(code, spans, offset=offset))
+    tokens: list[Any] = []
+    t_append = tokens.append
+    for start, length, kind in spans:
+        value: Any = kind
+        if isinstance(kind, Rule):
+            if output == "values":
+                value = kind.convert(code[start : start + length])
+            elif output == "lazy":
+                value = LazyValue(kind, code, start, start + length)
+        t_append((start + offset, value) if with_positions else value)
+    return tokens
+
+
+def assemble_bytes(
+    view: memoryview,
+    spans: Iterable[tuple[int, int, Kind]],
+    *,
+    decode: bool,
+    offset: int = 0,
+    output: Output,
+    with_positions: bool,
+) -> list[Any]:
+    if output == "tokens":
+        return list(iter_tokens_bytes(view, spans, decode=decode, offset=offset))
+    tokens: list[Any] = []
+    t_append = tokens.append
+    for start, length, kind in spans:
+        value: Any = kind
+        if isinstance(kind, Rule):
+            if output == "values":
+                value = convert_bytes(kind, view[start : start + length], decode)
+            elif output == "lazy":
+                value = LazyValue(kind, view, start, start + length, decode=decode)
+        t_append((start + offset, value) if with_positions else value)
+    return tokens
+
+
+def convert_bytes(rule: Rule[Any], chunk: memoryview, decode: bool) -> Any:  # noqa: FBT001
+    if decode or rule.converter is not None:
+        return rule.convert(str(chunk, "utf-8"))
+    return chunk
+
+
+def iter_tokens(
+    code: str, spans: Iterable[tuple[int, int, Kind]], *, offset: int = 0
+) -> Iterator[Token]:
+    for start, length, kind in spans:
+        value: Any = kind
+        if isinstance(kind, Rule):
+            value = kind.convert(code[start : start + length])
+        yield Token(kind, value, start + offset, start + length + offset)
+
+
+def iter_tokens_bytes(
+    view: memoryview,
+    spans: Iterable[tuple[int, int, Kind]],
+    *,
+    decode: bool,
+    offset: int = 0,
+) -> Iterator[Token]:
+    for start, length, kind in spans:
+        value: Any = kind
+        if isinstance(kind, Rule):
+            value = convert_bytes(kind, view[start : start + length], decode)
+        yield Token(kind, value, start + offset, start + length + offset)
+
+
+def drop_incomplete(spans: list[tuple[int, int, Kind]], text: str | bytes) -> int:
+    """
+    Removes the spans of tokens which might continue past the end of `text`
+    and returns the position of the input following the remaining tokens.
+    Tokens are considered complete once they're followed by a newline.
+    """
+    newline = text.rfind("\n") if isinstance(text, str) else text.rfind(b"\n")
+    complete = 0
+    for start, length, _ in spans:
+        if start + length > newline:
+            break
+        complete += 1
+    del spans[complete:]
+    if not spans:
+        return 0
+    start, length, _ = spans[-1]
+    return start + length
+
+
+def add_invalid(invalid: list[tuple[int, int]], pos: int) -> None:
+    """Records an unknown character at `pos`, merging it with an adjacent one."""
+    if invalid and invalid[-1][1] == pos:
+        invalid[-1] = (invalid[-1][0], pos + 1)
+    else:
+        invalid.append((pos, pos + 1))
+
+
+def kind_indices(kinds: tuple[Kind, ...]) -> dict[Kind, int]:
+    """Maps token kinds to their indices (the first one for equal rules)."""
+    return {k: i for i, k in reversed(list(enumerate(kinds)))}
 
 
 def invert_enum(enum: type[Enum]) -> dict[str, Enum]:
@@ -23,14 +171,124 @@ def invert_enum(enum: type[Enum]) -> dict[str, Enum]:
     return out
 
 
-Tree: TypeAlias = "dict[str, Enum | Tree]"
+def flatten_kinds(kinds: Iterable[Kind | RuleGroup]) -> set[Kind]:
+    out: set[Kind] = set()
+    for k in kinds:
+        if isinstance(k, RuleGroup):
+            out.update(k)
+        else:
+            out.add(k)
+    return out
+
+
+# Keys are characters (or byte values), "" marks the end of a token
+Tree: TypeAlias = "dict[Any, Enum | Tree]"
+
+
+def empty_handler(_: Tree, __: str | memoryview) -> tuple[Enum | None, int]:
+    return None, 1
+
+
+def walk_tree(tree: Tree, string: str | memoryview) -> tuple[Enum | None, int]:
+    break_path: tuple[Enum, int] | None = None
+
+    for i, v in enumerate(string):
+        if "" in tree:
+            break_path = (cast("Enum", tree[""]), i)
+
+        c = tree.get(v)
+        if c is None:
+            if "" not in tree:
+                break
+            return cast("Enum", tree[""]), i
+        if isinstance(c, Enum):
+            return c, i + 1
+        tree = c
+    else:
+        # The input ended on a token which is a prefix of a longer token
+        if "" in tree:
+            return cast("Enum", tree[""]), len(string)
+
+    if break_path:
+        return break_path
+
+    return None, 0
+
+
+@cache
+def case_tables() -> tuple[dict[int, int], dict[str, str]]:
+    """
+    Returns the simple (single character) case folding of every character
+    which has one, for use with `str.translate`, and the characters folding
+    to each character.
+    """
+    fold: dict[int, int] = {}
+    variants: dict[str, str] = {}
+    # Characters outside of the first two planes have no case mappings
+    for i in range(0x20000):
+        c = chr(i)
+        if len(f := c.casefold()) != 1 and len(f := c.lower()) != 1:
+            continue
+        if f != c:
+            fold[i] = ord(f)
+            variants[f] = variants.get(f, "") + c
+    return fold, variants
+
+
+def fold_tokens(tokens: dict[str, Enum]) -> dict[str, Enum]:
+    fold = case_tables()[0]
+    out: dict[str, Enum] = {}
+    for k, v in tokens.items():
+        if out.setdefault(folded := k.translate(fold), v) is not v:
+            msg = f"{k!r} is ambiguous when case-insensitive ({folded!r} is taken)"
+            raise CrossandraValueError(msg)
+    return out
+
+
+def add_case_variants(tree: Tree) -> None:
+    """Adds edges for all case variants of each character in the tree."""
+    variants = case_tables()[1]
+    for k, v in list(tree.items()):
+        # Aliased edges share the subtree, so the tree doesn't grow
+        for c in variants.get(k, ""):
+            tree[c] = v
+        if isinstance(v, dict):
+            add_case_variants(v)
 
 
-def empty_handler(string: str) -> tuple[Result[Enum, str], int]:
-    return Err(string[0]), 1
+def encode_tree(tree: Tree, memo: dict[int, Tree] | None = None) -> Tree:
+    """Converts a tree of characters into a tree of their UTF-8 bytes."""
+    memo = {} if memo is None else memo
+    if (out := memo.get(id(tree))) is not None:
+        return out
+    out = memo[id(tree)] = {}
+    for k, v in tree.items():
+        if k == "":
+            out[""] = v
+            continue
+        node = out
+        *lead, last = k.encode()
+        for b in lead:
+            node = cast("Tree", node.setdefault(b, {}))
+        node[last] = v if isinstance(v, Enum) else encode_tree(v, memo)
+    return out
+
 
+def tree_depth(tree: Tree, memo: dict[int, int] | None = None) -> int:
+    """Returns the length of the longest token in the tree."""
+    memo = {} if memo is None else memo
+    if (depth := memo.get(id(tree))) is None:
+        depth = memo[id(tree)] = max(
+            (
+                1 + tree_depth(v, memo) if isinstance(v, dict) else int(k != "")
+                for k, v in tree.items()
+            ),
+            default=0,
+        )
+    return depth
 
-def generate_tree(inp: Iterable[tuple[str, Enum]]) -> Tree:
+
+def generate_tree(inp: Iterable[tuple[str | bytes, Enum]]) -> Tree:
     inp = sorted(inp, key=lambda v: len(v[0]), reverse=True)
     result: Tree = {}
     for k, v in inp:
@@ -45,6 +303,29 @@ def generate_tree(inp: Iterable[tuple[str, Enum]]) -> Tree:
     return result
 
 
+def compile_enum(
+    token_source: type[Enum], *, case_insensitive: bool, has_rules: bool
+) -> EnumCore:
+    tokens = invert_enum(token_source)
+    if case_insensitive:
+        tokens = fold_tokens(tokens)
+    fast = all(len(k) == 1 for k in tokens) and not has_rules
+    if case_insensitive and fast:
+        # Cheap for single characters, and keeps Fast Mode a lookup
+        variants = case_tables()[1]
+        for k, v in list(tokens.items()):
+            tokens.update(dict.fromkeys(variants.get(k, ""), v))
+    tree = generate_tree(tokens.items())
+    if case_insensitive:
+        add_case_variants(tree)
+    keys = tuple(sorted(tokens, key=len, reverse=True))
+    return EnumCore(tokens, keys, tree, fast=fast)
+
+
+def compile_dispatch(rules: tuple[Rule[Any], ...]) -> RuleDispatch:
+    return RuleDispatch(tuple((r, first_chars(r.pattern, r.flags)) for r in rules))
+
+
 class Empty(Enum):
     """An empty enum. Used by Crossandra if no enum is supplied."""
 
@@ -62,16 +343,36 @@ class Crossandra:
     - `suppress_unknown`: whether unknown token errors should be suppressed
       (defaults to False)
     - `rules`: a list of additional rules to use
+    - `longest_match`: whether the longest matching token should be chosen
+      among all enum tokens and rules (defaults to False)
+    - `case_insensitive`: whether enum tokens should be matched regardless
+      of case (defaults to False)
 
     The enum takes priority over the rule list.\\
-    The list of rules is ordered by priority (descending).
+    The list of rules is ordered by priority (descending). With
+    `longest_match=True`, priority only breaks ties between matches of the
+    same length.
+
+    A tokenizer's configuration is never modified after construction, and it
+    can be shared between threads (including on free-threaded builds). The
+    only state written afterwards is caches filled on first use (the Fast
+    Mode tables, the bytes tables, the rule dispatch table, and each rule's
+    compiled patterns), which threads can safely race to fill.
     """
 
     __slots__ = (
+        "__candidates",
+        "__case_insensitive",
         "__conv_crlf",
+        "__core",
+        "__dispatch",
         "__fast",
+        "__fast_tables",
+        "__first_chars",
         "__ignored",
+        "__ignored_bytes",
         "__keys",
+        "__longest",
         "__maxlen",
         "__rules",
         "__suppress",
@@ -88,78 +389,344 @@ class Crossandra:
         ignored_characters: str = "",
         rules: list[Rule[Any] | RuleGroup] | None = None,
         suppress_unknown: bool = False,
+        longest_match: bool = False,
+        case_insensitive: bool = False,
     ) -> None:
-        self.__rules: list[Rule[Any]] = []
+        flat_rules: list[Rule[Any]] = []
         for r in rules or []:
             if isinstance(r, RuleGroup):
-                self.__rules.extend(r)
+                flat_rules.extend(r)
             else:
-                self.__rules.append(r)
+                flat_rules.append(r)
+        for rule in flat_rules:
+            rule.compile()
+        self.__rules = tuple(flat_rules)
         self.__conv_crlf = convert_crlf
-        self.__tokens = invert_enum(token_source)
-        self.__fast = all(len(k) == 1 for k in self.__tokens) and not rules
+        # Compiled state is shared between tokenizers with the same enum (and
+        # the same rule objects), and released once none of them is left
+        self.__core = core = intern(
+            ENUM_CORES,
+            (token_source, case_insensitive, bool(rules)),
+            partial(
+                compile_enum,
+                token_source,
+                case_insensitive=case_insensitive,
+                has_rules=bool(rules),
+            ),
+        )
+        self.__tokens = core.tokens
+        self.__keys = core.keys
+        self.__maxlen = core.maxlen
+        self.__tree = core.tree
+        self.__fast = core.fast
+        # Like the other caches filled on first use, built completely before
+        # being stored and never modified after, so threads can race to fill it
+        self.__fast_tables: FastTables | None = None
+        self.__case_insensitive = case_insensitive
         self.__ignored = " \f\t\v\r\n" * ignore_whitespace + ignored_characters
-        self.__keys = sorted(self.__tokens, key=len, reverse=True)
-        self.__maxlen = max(map(len, self.__keys or ["1"]))
+        self.__ignored_bytes = (
+            self.__ignored.encode() if self.__ignored.isascii() else None
+        )
         self.__suppress = suppress_unknown
-        self.__tree = generate_tree(self.__tokens.items())
+        self.__longest = longest_match
+        # Rules which can match at a given character (or byte), found through
+        # the characters their matches can start with and filled in lazily
+        if longest_match:
+            self.__dispatch = intern(
+                RULE_DISPATCHES,
+                tuple(map(id, flat_rules)),
+                partial(compile_dispatch, self.__rules),
+            )
+        else:
+            self.__dispatch = RuleDispatch(())
+        self.__first_chars = self.__dispatch.first_chars
+        self.__candidates = self.__dispatch.candidates
 
     def tokenize(
-        self, code: str, *, with_positions: bool = False
+        self,
+        code: Source,
+        *,
+        decode: bool = False,
+        exclude: Iterable[Kind | RuleGroup] | None = None,
+        include: Iterable[Kind | RuleGroup] | None = None,
+        output: Output = "values",
+        with_positions: bool = False,
     ) -> list[Any] | list[tuple[int, Any]]:
         """
-        Tokenizes the input string. Returns a list of tokens.
+        Tokenizes the input string. Returns a list of tokens. `output`
+        controls what is produced for tokens matched by rules:
+        - `"values"`: the result of applying the rule (default)
+        - `"lazy"`: a `LazyValue` calling the rule's converter on first access
+        - `"kinds"`: the `Rule` itself (no converter is called)
+        - `"tokens"`: a `Token` with the kind, value, start, and end of every
+          token (including enum tokens; implies positions)
+
+        When `include` is given, only tokens of the given kinds (enum members
+        and rules) are returned. Tokens of kinds in `exclude` are never
+        returned. Filtered out tokens are not converted.
+
+        The input can also be `bytes`, `bytearray`, or a `memoryview`, in
+        which case positions are byte offsets and rules without a converter
+        produce `memoryview` slices of the input (or strings when `decode` is
+        True).
         """
-        if self.__conv_crlf:
-            code = code.replace("\r\n", "\n")
-        if " " in self.__ignored:
-            code += " "
+        check_output(output)
+        excluded = self.__excluded(include, exclude)
+        if (hook := tracing.HOOK) is None:
+            return self.__tokenize(code, excluded, decode, output, with_positions)
+        tracer, every = hook
+        size = len(code) if isinstance(code, str) else memoryview(code).nbytes
+        tracer.start(self, size)
+        start = perf_counter()
+        count = -1  # Reported when tokenization fails
+        try:
+            tokens = self.__tokenize(
+                code, excluded, decode, output, with_positions, hook if every else None
+            )
+            count = len(tokens)
+        finally:
+            tracer.end(self, size, count, perf_counter() - start)
+        return tokens
 
-        if self.__fast:
-            toks = self.__tokenize_fast(code, with_positions=with_positions)
-            if toks.is_ok():
-                return toks.unwrap()
-            msg = f"invalid token: {toks.unwrap_err()!r}"
-            raise CrossandraTokenizationError(msg)
+    def __tokenize(
+        self,
+        code: Source,
+        excluded: frozenset[Kind],
+        decode: bool,  # noqa: FBT001
+        output: Output,
+        with_positions: bool,  # noqa: FBT001
+        sample: tuple[Tracer, int] | None = None,
+    ) -> list[Any] | list[tuple[int, Any]]:
+        """
+        Tokenizes the input string like `tokenize`. When `sample` is given,
+        spans are reported to its tracer on the way, which Fast Mode's bulk
+        lookups can't do.
+        """
+        spans: Iterator[tuple[int, int, Kind]]
+        if not isinstance(code, str):
+            view = self.__prepare_bytes(code)
+            spans = self.__scan_bytes(view, excluded)
+            if sample is not None:
+                spans = sample_spans(self, spans, *sample)
+            return assemble_bytes(
+                view, spans, decode=decode, output=output, with_positions=with_positions
+            )
+        code = self.__prepare(code)
 
-        original_size = len(code)
-        tokens: list[Any] = []
-        maxlen = self.__maxlen
-        ignored = self.__ignored
-        t_append = tokens.append
-        handle = self.__handle if self.__tokens else empty_handler
-        while code := code.lstrip(ignored):
-            token, length = handle(code[:maxlen])
-            if token.is_ok():
-                t_append(
-                    (original_size - len(code), token.unwrap())
-                    if with_positions
-                    else token.unwrap()
+        if self.__fast:
+            if output != "tokens" and sample is None:
+                return self.__tokenize_fast(
+                    code, excluded=excluded, with_positions=with_positions
                 )
-                code = code[length:]
-                continue
-            for rule in self.__rules:
-                tok = rule.apply(code)
-                if not isinstance(tok, NotApplied):
-                    token_, length = tok
-                    if not isinstance(token_, Ignored):
-                        t_append(
-                            (original_size - len(code), token_)
-                            if with_positions
-                            else token_
-                        )
-                    code = code[length:]
-                    break
-            else:
-                if not self.__suppress:
-                    msg = f"invalid token: {token.unwrap_err()!r}"
-                    raise CrossandraTokenizationError(msg)
-                code = code[1:]
+            spans = self.__scan_fast(code, excluded)
+        else:
+            spans = self.__scan(code, excluded)
+        if sample is not None:
+            spans = sample_spans(self, spans, *sample)
+        return assemble(code, spans, output=output, with_positions=with_positions)
 
-        return tokens
+    def tokenize_into(
+        self,
+        code: Source,
+        sink: Sink,
+        *,
+        batch_size: int = 4096,
+        exclude: Iterable[Kind | RuleGroup] | None = None,
+        include: Iterable[Kind | RuleGroup] | None = None,
+    ) -> int:
+        """
+        Tokenizes the input string, writing the `(start, length, kind)` span
+        of every token to `sink` in batches of up to `batch_size` instead of
+        building a list, and flushes the sink at the end. Returns the number
+        of tokens written. Rules are not applied. `include` and `exclude`
+        work like in `tokenize`.
+        """
+        excluded = self.__excluded(include, exclude)
+        spans: Iterator[tuple[int, int, Kind]]
+        if not isinstance(code, str):
+            spans = self.__scan_bytes(self.__prepare_bytes(code), excluded)
+        elif self.__fast:
+            spans = self.__scan_fast(self.__prepare(code), excluded)
+        else:
+            spans = self.__scan(self.__prepare(code), excluded)
+        count = 0
+        write = sink.write
+        while batch := list(islice(spans, batch_size)):
+            write(batch)
+            count += len(batch)
+        sink.flush()
+        return count
+
+    def tokenize_with_errors(
+        self,
+        code: Source,
+        *,
+        decode: bool = False,
+        exclude: Iterable[Kind | RuleGroup] | None = None,
+        include: Iterable[Kind | RuleGroup] | None = None,
+        output: Output = "values",
+        with_positions: bool = False,
+    ) -> tuple[list[Any] | list[tuple[int, Any]], list[InvalidSpan]]:
+        """
+        Tokenizes the input string like `tokenize`, but skips unknown
+        characters instead of raising an error (regardless of
+        `suppress_unknown`). Returns a list of tokens and a list of the
+        skipped spans, where adjacent unknown characters form a single span.
+        """
+        check_output(output)
+        excluded = self.__excluded(include, exclude)
+        invalid: list[tuple[int, int]] = []
+        if not isinstance(code, str):
+            view = self.__prepare_bytes(code)
+            tokens = assemble_bytes(
+                view,
+                self.__scan_bytes(view, excluded, invalid=invalid),
+                decode=decode,
+                output=output,
+                with_positions=with_positions,
+            )
+            return tokens, [InvalidSpan(s, e, bytes(view[s:e])) for s, e in invalid]
+        code = self.__prepare(code)
+        if self.__fast:
+            spans = self.__scan_fast(code, excluded, invalid=invalid)
+        else:
+            spans = self.__scan(code, excluded, invalid=invalid)
+        tokens = assemble(code, spans, output=output, with_positions=with_positions)
+        return tokens, [InvalidSpan(s, e, code[s:e]) for s, e in invalid]
+
+    def iter_tokens(self, code: Source, *, decode: bool = False) -> Iterator[Token]:
+        """
+        Lazily tokenizes the input string, yielding a `Token` for every token
+        as soon as it's found (like `tokenize(output="tokens")`, but without
+        building a list). Errors are raised when the unknown character is
+        reached.
+        """
+        if not isinstance(code, str):
+            view = self.__prepare_bytes(code)
+            return iter_tokens_bytes(view, self.__scan_bytes(view), decode=decode)
+        code = self.__prepare(code)
+        if self.__fast:
+            return iter_tokens(code, self.__scan_fast(code))
+        return iter_tokens(code, self.__scan(code))
+
+    def scan(self, code: Source) -> Iterator[tuple[int, int, Kind]]:
+        """
+        Scans the input string, yielding a `(start, length, kind)` triple for
+        every token, where `kind` is either an enum member or the `Rule` that
+        matched. Positions are relative to the input string after CRLF
+        conversion. Rules are not applied; use `assemble` to build the output
+        of `tokenize` from the yielded triples.
+        """
+        if not isinstance(code, str):
+            return self.__scan_bytes(self.__prepare_bytes(code))
+        code = self.__prepare(code)
+        if self.__fast:
+            return self.__scan_fast(code)
+        return self.__scan(code)
+
+    def assemble(
+        self,
+        code: Source,
+        spans: Iterable[tuple[int, int, Kind]],
+        *,
+        decode: bool = False,
+        output: Output = "values",
+        with_positions: bool = False,
+    ) -> list[Any] | list[tuple[int, Any]]:
+        """
+        Builds the output of `tokenize` for the input string from the
+        `(start, length, kind)` triples produced by `scan` for that string.
+        """
+        check_output(output)
+        if not isinstance(code, str):
+            return assemble_bytes(
+                self.__prepare_bytes(code),
+                spans,
+                decode=decode,
+                output=output,
+                with_positions=with_positions,
+            )
+        return assemble(
+            self.__prepare(code), spans, output=output, with_positions=with_positions
+        )
+
+    def analyze(self, *, fuzz: float = 0.0, strict: bool = False) -> list[PatternIssue]:
+        """
+        Analyzes every rule like `Rule.analyze`, and also reports rules which
+        can never match because the characters they start with are always
+        taken by enum tokens, earlier rules, or ignored characters. Returns
+        the issues found, or raises a `CrossandraValueError` listing them
+        when `strict` is True.
+        """
+        issues: list[PatternIssue] = []
+        for i, rule in enumerate(self.__rules):
+            issues.extend(rule.analyze(fuzz=fuzz))
+            if (message := self.__shadowing(i)) is not None:
+                issues.append(PatternIssue(rule, "shadowed", message))
+        if strict:
+            raise_issues(issues)
+        return issues
+
+    @property
+    def kinds(self) -> tuple[Kind, ...]:
+        """All token kinds: enum members (in definition order), then rules."""
+        return (*dict.fromkeys(self.__tokens.values()), *self.__rules)
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        A hex digest identifying the tokenizer's configuration. Tokenizers
+        with the same fingerprint split every input into the same tokens and
+        have the same `kinds` in the same order (rule converters are not taken
+        into account).
+        """
+        from hashlib import sha256
+
+        config = (
+            sorted((k, type(v).__qualname__, v.name) for k, v in self.__tokens.items()),
+            # Ordered, as cached results and token files store kinds by index
+            [
+                (type(k).__qualname__, k.name)
+                if isinstance(k, Enum)
+                else (k.pattern, k.flags, k.ignore)
+                for k in self.kinds
+            ],
+            self.__conv_crlf,
+            self.__ignored,
+            self.__suppress,
+            self.__longest,
+            self.__case_insensitive,
+        )
+        return sha256(repr(config).encode()).hexdigest()
+
+    def count(
+        self,
+        code: Source,
+        *,
+        exclude: Iterable[Kind | RuleGroup] | None = None,
+        include: Iterable[Kind | RuleGroup] | None = None,
+    ) -> dict[Kind, int]:
+        """
+        Counts the tokens in the input string without building a token list
+        or calling any converters. Returns a dictionary mapping token kinds
+        (enum members and rules) to their number of occurrences. `include`
+        and `exclude` work like in `tokenize`.
+        """
+        excluded = self.__excluded(include, exclude)
+        if isinstance(code, str):
+            code = self.__prepare(code)
+            if self.__fast:
+                return self.__count_fast(code, excluded)
+            spans = self.__scan(code, excluded)
+        else:
+            spans = self.__scan_bytes(self.__prepare_bytes(code), excluded)
+        counts: dict[Kind, int] = {}
+        for _, _, kind in spans:
+            counts[kind] = counts.get(kind, 0) + 1
+        return counts
 
     def tokenize_lines(
-        self, code: str, *, with_positions: bool = False
+        self, code: str, *, output: Output = "values", with_positions: bool = False
     ) -> list[list[Any]] | list[list[tuple[int, Any]]]:
         """
         Tokenizes the input string line by line. Returns a nested list
@@ -168,46 +735,632 @@ class Crossandra:
         `[foo.tokenize(line) for line in source.splitlines()]`.
         """
         return [
-            self.tokenize(line, with_positions=with_positions)
+            self.tokenize(line, output=output, with_positions=with_positions)
             for line in code.splitlines()
         ]
 
-    def __handle(self, string: str) -> tuple[Result[Enum, str], int]:
-        tree = self.__tree
-        break_path: tuple[Enum, int] | None = None
+    def tokenize_many(
+        self,
+        sources: Iterable[Source],
+        *,
+        decode: bool = False,
+        output: Output = "values",
+        with_positions: bool = False,
+        max_workers: int | None = None,
+    ) -> list[list[Any]] | list[list[tuple[int, Any]]]:
+        """
+        Tokenizes multiple input strings in parallel using a thread pool
+        (`max_workers` is passed to `ThreadPoolExecutor`). Returns a nested
+        list of tokens, where each inner list corresponds to the input string
+        at the same index. Equivalent to
+        `[foo.tokenize(source) for source in sources]`.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(
+                executor.map(
+                    lambda source: self.tokenize(
+                        source,
+                        decode=decode,
+                        output=output,
+                        with_positions=with_positions,
+                    ),
+                    sources,
+                )
+            )
+
+    def feed(
+        self,
+        chunk: Source,
+        state: StreamState | None = None,
+        *,
+        decode: bool = False,
+        final: bool = False,
+        max_buffer: int = 1024 * 1024,
+        output: Output = "values",
+        with_positions: bool = False,
+    ) -> tuple[list[Any] | list[tuple[int, Any]], StreamState]:
+        """
+        Tokenizes the next chunk of an input fed incrementally. Returns a list
+        of the tokens which are complete so far and the state to pass along
+        with the next chunk. The tail of the input which might still be part
+        of an unfinished token is carried over to the next call (up to
+        `max_buffer` characters, after which only the last token is). Pass
+        `final=True` with the last chunk to flush the remaining input.
+        Positions are relative to the start of the whole input.
+        """
+        # Only imported here (and below), as streaming is a separate feature
+        # which `import crossandra` shouldn't pay for
+        from .stream import StreamState
+
+        check_output(output)
+        state = state or StreamState()
+        text = self.__join(state.carry, chunk)
+        spans, cut = self.__scan_text(text, offset=state.offset, partial=not final)
+        if not final:
+            if cut == len(text):
+                # Otherwise, scanning stopped at an unknown character
+                cut = drop_incomplete(spans, text)
+            if len(text) - cut > max_buffer:
+                # Too much input without a newline; as a last resort, only
+                # the last token is assumed to be incomplete
+                spans, cut = self.__scan_text(text, offset=state.offset, partial=False)
+                if len(spans) > 1:
+                    cut = spans.pop()[0]
+        if isinstance(text, str):
+            tokens = assemble(
+                text,
+                spans,
+                offset=state.offset,
+                output=output,
+                with_positions=with_positions,
+            )
+        else:
+            tokens = assemble_bytes(
+                memoryview(text),
+                spans,
+                decode=decode,
+                offset=state.offset,
+                output=output,
+                with_positions=with_positions,
+            )
+        return tokens, StreamState(state.offset + cut, text[cut:])
+
+    def tokenize_stream(
+        self,
+        chunks: Iterable[Source],
+        *,
+        decode: bool = False,
+        max_buffer: int = 1024 * 1024,
+        output: Output = "values",
+        with_positions: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Lazily tokenizes an input split into chunks (e.g. a file read in
+        blocks), yielding tokens as soon as they are complete. Tokens can
+        span multiple chunks. See `feed` for the meaning of `max_buffer`.
+        """
+        feed = partial(
+            self.feed,
+            decode=decode,
+            max_buffer=max_buffer,
+            output=output,
+            with_positions=with_positions,
+        )
+        state = None
+        for chunk in chunks:
+            tokens, state = feed(chunk, state)
+            yield from tokens
+        if state is not None:
+            tokens, _ = feed(state.carry[:0], state, final=True)
+            yield from tokens
+
+    def atokenize(
+        self,
+        reader: asyncio.StreamReader,
+        *,
+        chunk_size: int = 64 * 1024,
+        decode: bool = False,
+        executor: Executor | None = None,
+        max_buffer: int = 1024 * 1024,
+        output: Output = "values",
+        with_positions: bool = False,
+    ) -> AsyncTokenIterator:
+        """
+        Asynchronously tokenizes bytes read from `reader` in chunks of up to
+        `chunk_size` bytes, yielding tokens as soon as they are complete.
+        The reader is only read from when more tokens are requested. When an
+        `executor` is given, chunks are tokenized in it instead of blocking
+        the event loop. See `feed` for the meaning of `max_buffer`.
+        """
+        check_output(output)
+
+        def feed(chunk: bytes, state: StreamState) -> tuple[list[Any], StreamState]:
+            return self.feed(
+                chunk,
+                state,
+                decode=decode,
+                final=not chunk,
+                max_buffer=max_buffer,
+                output=output,
+                with_positions=with_positions,
+            )
+
+        # Only imported here, as only asyncio users need it
+        from .aio import AsyncTokenIterator
 
-        for i, v in enumerate(string):
-            if "" in tree:
-                break_path = (cast("Enum", tree[""]), i)
+        return AsyncTokenIterator(feed, reader, chunk_size, executor)
 
-            c = tree.get(v)
-            if c is None:
-                if "" not in tree:
+    def follow(
+        self,
+        path: str | os.PathLike[str],
+        state: FollowState | None = None,
+        *,
+        chunk_size: int = 64 * 1024,
+        decode: bool = False,
+        interval: float = 1.0,
+        max_buffer: int = 1024 * 1024,
+        output: Output = "values",
+        timeout: float | None = None,
+        with_positions: bool = False,
+    ) -> Iterator[tuple[list[Any] | list[tuple[int, Any]], FollowState]]:
+        """
+        Tokenizes a file which keeps growing (e.g. a log) in chunks of up to
+        `chunk_size` bytes, starting from `state` (as yielded by a previous
+        call). Yields the tokens complete so far and the state to resume from
+        after every read. An unfinished last line is carried over until it's
+        completed. At the end of the file, its size is checked every
+        `interval` seconds, and following stops once it hasn't grown for
+        `timeout` seconds (never by default). When the file is truncated or
+        replaced (e.g. by log rotation), the rest of the old file is flushed
+        and the new one is followed from its start. See `feed` for the
+        meaning of `max_buffer`.
+        """
+        check_output(output)
+
+        def feed(chunk: bytes, state: StreamState) -> tuple[list[Any], StreamState]:
+            return self.feed(
+                chunk,
+                state,
+                decode=decode,
+                final=not chunk,
+                max_buffer=max_buffer,
+                output=output,
+                with_positions=with_positions,
+            )
+
+        from .stream import FollowState, follow_file
+
+        return follow_file(
+            feed,
+            path,
+            state or FollowState(),
+            chunk_size=chunk_size,
+            interval=interval,
+            timeout=timeout,
+        )
+
+    def tokenize_file(
+        self,
+        path: str | os.PathLike[str],
+        state: FollowState | None = None,
+        *,
+        chunk_size: int = 64 * 1024,
+        decode: bool = False,
+        max_buffer: int = 1024 * 1024,
+        output: Output = "values",
+        stop: int | None = None,
+        with_positions: bool = False,
+    ) -> Iterator[tuple[list[Any] | list[tuple[int, Any]], FollowState]]:
+        """
+        Tokenizes a file in chunks of up to `chunk_size` bytes, starting from
+        `state` (as yielded by a previous call, possibly in another process).
+        Yields the tokens complete so far and the state to resume from after
+        every read, and flushes the input at the end of the file. When `stop`
+        is given, reading stops at that byte position without flushing, so
+        the rest can be tokenized by resuming from the last state. Either way,
+        the tokens are the same as when tokenizing the whole file at once,
+        unless more than `max_buffer` bytes go by without a newline: `feed`
+        then splits a token at a read boundary.
+        """
+        check_output(output)
+
+        def feed(chunk: bytes, state: StreamState) -> tuple[list[Any], StreamState]:
+            return self.feed(
+                chunk,
+                state,
+                decode=decode,
+                final=not chunk,
+                max_buffer=max_buffer,
+                output=output,
+                with_positions=with_positions,
+            )
+
+        from .stream import FollowState, read_file
+
+        return read_file(
+            feed, path, state or FollowState(), chunk_size=chunk_size, stop=stop
+        )
+
+    def __join(self, carry: str | bytes, chunk: Source) -> str | bytes:
+        """Appends a chunk to the carried over input, converting CRLFs."""
+        if isinstance(chunk, str) is not isinstance(carry, str) and carry:
+            msg = "cannot mix str and bytes chunks"
+            raise CrossandraValueError(msg)
+        if isinstance(chunk, str):
+            carry = cast("str", carry)
+            if self.__conv_crlf:
+                chunk = chunk.replace("\r\n", "\n")
+                if chunk[:1] == "\n" and carry[-1:] == "\r":
+                    carry = carry[:-1]
+            return carry + chunk
+        carry = cast("bytes", carry or b"")
+        if self.__conv_crlf:
+            chunk = CRLF.sub(b"\n", chunk)
+            if chunk[:1] == b"\n" and carry[-1:] == b"\r":
+                carry = carry[:-1]
+        return carry + chunk
+
+    def __scan_text(
+        self, text: str | bytes, *, offset: int, partial: bool
+    ) -> tuple[list[tuple[int, int, Kind]], int]:
+        """Returns all spans and the position where scanning stopped."""
+        # As in `drop_incomplete`, anything followed by a newline is complete,
+        # so only unknown characters past the last one stop scanning
+        stop_from: int | None = None
+        if isinstance(text, str):
+            if partial:
+                stop_from = text.rfind("\n")
+            scanner = self.__scan(text, stop_from=stop_from)
+        else:
+            if partial:
+                stop_from = text.rfind(b"\n")
+            scanner = self.__scan_bytes(memoryview(text), stop_from=stop_from)
+        spans: list[tuple[int, int, Kind]] = []
+        append = spans.append
+        try:
+            while True:
+                append(next(scanner))
+        except StopIteration as e:
+            return spans, cast("int", e.value)
+        except CrossandraTokenizationError as e:
+            # Reported relative to the whole input
+            raise CrossandraTokenizationError(
+                e.token, offset + cast("int", e.offset)
+            ) from None
+
+    def __prepare(self, code: str) -> str:
+        if self.__conv_crlf:
+            code = code.replace("\r\n", "\n")
+        return code
+
+    def __prepare_bytes(self, code: bytes | bytearray | memoryview) -> memoryview:
+        view = memoryview(code)
+        if view.format != "B" or view.ndim != 1:
+            view = view.cast("B")
+        if self.__conv_crlf and CRLF.search(view):
+            view = memoryview(CRLF.sub(b"\n", view))
+        return view
+
+    def __get_bytes_tables(
+        self,
+    ) -> tuple[Tree, bytes, list[Enum | None] | None, int]:
+        if (ignored := self.__ignored_bytes) is None:
+            msg = "ignored characters must be ASCII to tokenize bytes"
+            raise CrossandraValueError(msg)
+        # Built on first use, as most tokenizers never see bytes. Only the
+        # enum-derived tables are shared; ignored characters are per tokenizer
+        if (tables := self.__core.bytes_tables) is None:
+            encoded = [(k.encode(), v) for k, v in self.__tokens.items()]
+            table: list[Enum | None] | None = None
+            if self.__fast and all(len(k) == 1 for k, _ in encoded):
+                table = [None] * 256
+                for k, v in encoded:
+                    table[k[0]] = v
+            tree = encode_tree(self.__tree)
+            tables = (tree, table, tree_depth(tree) or 1)
+            self.__core.bytes_tables = tables
+        tree, table, maxlen = tables
+        return tree, ignored, table, maxlen
+
+    def __unknown(
+        self, token: str | bytes, pos: int, invalid: list[tuple[int, int]] | None
+    ) -> None:
+        """Records or raises an error for an unknown character at `pos`."""
+        if invalid is not None:
+            add_invalid(invalid, pos)
+        elif not self.__suppress:
+            raise CrossandraTokenizationError(token, pos)
+
+    def __skipped_rules(
+        self, excluded: frozenset[Kind]
+    ) -> tuple[list[tuple[Rule[Any], bool]], frozenset[Kind]]:
+        """
+        Returns the rules to try in order (with whether their tokens are
+        skipped) and the kinds whose tokens are skipped. In longest match
+        mode, rules are tried through `__get_candidates` instead.
+        """
+        if self.__longest:
+            return [], excluded.union(r for r in self.__rules if r.ignore)
+        return [(r, r.ignore or r in excluded) for r in self.__rules], excluded
+
+    def __longest_match(
+        self, target: str | memoryview, key: str | int, kind: Kind | None, length: int
+    ) -> tuple[Kind | None, int]:
+        """
+        Returns the longest of the enum token match (`kind` and `length`) and
+        the matches of the rules which can start with `key`.
+        """
+        if kind is None:
+            length = 0
+        if (matching := self.__candidates.get(key)) is None:
+            matching = self.__get_candidates(key)
+        for rule in matching:
+            if isinstance(target, str):
+                rule_length = rule.match(target)
+            else:
+                rule_length = rule.match_bytes(target)
+            if not isinstance(rule_length, NotApplied) and rule_length > length:
+                kind, length = rule, rule_length
+        return kind, length
+
+    def __shadowing(self, index: int) -> str | None:
+        """
+        Describes why the rule at `index` can never match, or returns None if
+        it might. Only rules with a known, finite set of first characters are
+        considered.
+        """
+        rule, earlier = self.__rules[index], self.__rules[:index]
+        for other in earlier:
+            if (other.pattern, other.flags) == (rule.pattern, rule.flags):
+                return f"duplicates the earlier rule {other.pattern!r}"
+        first = first_chars(rule.pattern, rule.flags)
+        if first is None or first[1] or not first[0]:
+            return None
+        # A match of a single character is a match of any input starting
+        # with it, unless the pattern looks around
+        prefix_rules = [
+            r for r in earlier if not has_assertions(r.pattern, r.flags)
+        ] * (not self.__longest)
+        # Enum tokens take priority over rules regardless of length
+        prefix_enums = not self.__longest and bool(self.__tree)
+        takers: dict[str, None] = {}
+        for c in sorted(first[0]):
+            if c in self.__ignored:
+                takers["ignored characters"] = None
+                continue
+            kind = walk_tree(self.__tree, c)[0] if prefix_enums else None
+            if kind is not None:
+                takers[repr(kind)] = None
+                continue
+            for r in prefix_rules:
+                if not isinstance(r.match(c), NotApplied):
+                    takers[f"the earlier rule {r.pattern!r}"] = None
                     break
-                return Ok(cast("Enum", tree[""])), i
-            if isinstance(c, Enum):
-                return Ok(c), i + 1
-            tree = c
+            else:
+                return None
+        return (
+            "can never match, as it only starts with characters taken by "
+            + ", ".join(takers)
+        )
 
-        if break_path:
-            return Ok(break_path[0]), break_path[1]
+    def __get_candidates(self, key: str | int) -> tuple[Rule[Any], ...]:
+        if isinstance(key, str):
+            matching = tuple(r for r, f in self.__first_chars if can_start(f, key))
+        else:
+            matching = tuple(
+                r for r, f in self.__first_chars if can_start_bytes(f, key)
+            )
+        self.__candidates[key] = matching
+        return matching
 
-        return Err(string[0]), 0
+    def __excluded(
+        self,
+        include: Iterable[Kind | RuleGroup] | None,
+        exclude: Iterable[Kind | RuleGroup] | None,
+    ) -> frozenset[Kind]:
+        excluded = flatten_kinds(exclude or ())
+        if include is not None:
+            kinds: set[Kind] = {*self.__tokens.values(), *self.__rules}
+            excluded.update(kinds - flatten_kinds(include))
+        return frozenset(excluded)
+
+    def __scan(
+        self,
+        code: str,
+        excluded: frozenset[Kind] = frozenset(),
+        *,
+        invalid: list[tuple[int, int]] | None = None,
+        stop_from: int | None = None,
+    ) -> Generator[tuple[int, int, Kind], None, int]:
+        """
+        Yields a `(start, length, kind)` triple for every non-ignored token,
+        where `kind` is either an enum member or the `Rule` that matched.
+        Tokens of kinds in `excluded` are skipped. When `stop_from` is given,
+        scanning stops at the first unknown character at or after that
+        position, as it might be the start of a token continuing past the end
+        of `code`. Returns the position where scanning stopped.
+
+        When `invalid` is given, unknown characters are recorded in it as
+        `(start, end)` spans instead of raising an error.
+        """
+        original_size = len(code)
+        maxlen = self.__maxlen
+        ignored = self.__ignored
+        longest = self.__longest
+        rules, skipped = self.__skipped_rules(excluded)
+        tree = self.__tree
+        walk = walk_tree if tree else empty_handler
+        kind: Kind | None
+        while code := code.lstrip(ignored):
+            kind, length = walk(tree, code[:maxlen])
+            if longest:
+                kind, length = self.__longest_match(code, code[0], kind, length)
+            if kind is not None:
+                if not skipped or kind not in skipped:
+                    yield original_size - len(code), length, kind
+                code = code[length:]
+                continue
+            for rule, skip in rules:
+                rule_length = rule.match(code)
+                if not isinstance(rule_length, NotApplied):
+                    if not skip:
+                        yield original_size - len(code), rule_length, rule
+                    code = code[rule_length:]
+                    break
+            else:
+                pos = original_size - len(code)
+                if stop_from is not None and pos >= stop_from:
+                    return pos
+                self.__unknown(code[0], pos, invalid)
+                code = code[1:]
+        return original_size
+
+    def __scan_bytes(
+        self,
+        view: memoryview,
+        excluded: frozenset[Kind] = frozenset(),
+        *,
+        invalid: list[tuple[int, int]] | None = None,
+        stop_from: int | None = None,
+    ) -> Generator[tuple[int, int, Kind], None, int]:
+        """`__scan` for bytes, walking the input by offset to avoid copies."""
+        tree, ignored, table, maxlen = self.__get_bytes_tables()
+        if table is not None:
+            return (
+                yield from self.__scan_fast_bytes(
+                    view, table, ignored, excluded, invalid=invalid, stop_from=stop_from
+                )
+            )
+        size = len(view)
+        longest = self.__longest
+        rules, skipped = self.__skipped_rules(excluded)
+        walk = walk_tree if tree else empty_handler
+        kind: Kind | None
+        pos = 0
+        while pos < size:
+            if (byte := view[pos]) in ignored:
+                pos += 1
+                continue
+            kind, length = walk(tree, view[pos : pos + maxlen])
+            if longest:
+                kind, length = self.__longest_match(view[pos:], byte, kind, length)
+            if kind is not None:
+                if not skipped or kind not in skipped:
+                    yield pos, length, kind
+                pos += length
+                continue
+            rest = view[pos:]
+            for rule, skip in rules:
+                rule_length = rule.match_bytes(rest)
+                if not isinstance(rule_length, NotApplied):
+                    if not skip:
+                        yield pos, rule_length, rule
+                    pos += rule_length
+                    break
+            else:
+                if stop_from is not None and pos >= stop_from:
+                    return pos
+                self.__unknown(bytes(view[pos : pos + 1]), pos, invalid)
+                pos += 1
+        return size
+
+    def __scan_fast_bytes(
+        self,
+        view: memoryview,
+        table: list[Enum | None],
+        ignored: bytes,
+        excluded: frozenset[Kind],
+        *,
+        invalid: list[tuple[int, int]] | None = None,
+        stop_from: int | None = None,
+    ) -> Generator[tuple[int, int, Kind], None, int]:
+        if excluded:
+            ignored += bytes(
+                b for b, v in enumerate(table) if v is not None and v in excluded
+            )
+        for i, b in enumerate(view):
+            if b in ignored:
+                continue
+            if (t := table[b]) is None:
+                if stop_from is not None and i >= stop_from:
+                    return i
+                self.__unknown(bytes((b,)), i, invalid)
+                continue
+            yield i, 1, t
+        return len(view)
+
+    def __get_fast_tables(self, excluded: frozenset[Kind]) -> FastTables:
+        # Tables without exclusions are built on first use and reused. In Fast
+        # Mode, excluded tokens are indistinguishable from ignored characters,
+        # so they're skipped with no per-token overhead
+        if not excluded and (tables := self.__fast_tables) is not None:
+            return tables
+        skipped = self.__ignored + "".join(
+            k for k, v in self.__tokens.items() if v in excluded
+        )
+        lookup: dict[str, Enum | None] = dict(self.__tokens)
+        lookup.update(dict.fromkeys(skipped))
+        tables = (dict.fromkeys(map(ord, skipped)), lookup)
+        if not excluded:
+            self.__fast_tables = tables
+        return tables
+
+    def __count_fast(self, code: str, excluded: frozenset[Kind]) -> dict[Kind, int]:
+        lookup = self.__get_fast_tables(excluded)[1]
+        counts: dict[Kind, int] = {}
+        unknown = set()
+        for char, n in Counter(code).items():
+            if (t := lookup.get(char)) is None:
+                if char not in lookup:
+                    unknown.add(char)
+                continue
+            counts[t] = counts.get(t, 0) + n
+        if unknown and not self.__suppress:
+            i = next(i for i, c in enumerate(code) if c in unknown)
+            raise CrossandraTokenizationError(code[i], i)
+        return counts
+
+    def __scan_fast(
+        self,
+        code: str,
+        excluded: frozenset[Kind] = frozenset(),
+        *,
+        invalid: list[tuple[int, int]] | None = None,
+    ) -> Iterator[tuple[int, int, Kind]]:
+        lookup = self.__get_fast_tables(excluded)[1]
+        for i, char in enumerate(code):
+            if (t := lookup.get(char)) is None:
+                if char not in lookup:
+                    self.__unknown(char, i, invalid)
+                continue
+            yield i, 1, t
 
     def __tokenize_fast(
-        self, code: str, *, with_positions: bool = False
-    ) -> Result[list[Enum], str] | Result[list[tuple[int, Enum]], tuple[int, str]]:
+        self,
+        code: str,
+        *,
+        excluded: frozenset[Kind] = frozenset(),
+        with_positions: bool = False,
+    ) -> list[Enum] | list[tuple[int, Enum]]:
+        delete, lookup = self.__get_fast_tables(excluded)
+        suppress = self.__suppress
+        if not (with_positions or suppress):
+            # Skipped characters are deleted and the rest looked up in bulk,
+            # without a Python-level step per character
+            kept = code.translate(delete) if delete else code
+            try:
+                return list(map(self.__tokens.__getitem__, kept))
+            except KeyError:
+                i = next(i for i, c in enumerate(code) if c not in lookup)
+                raise CrossandraTokenizationError(code[i], i) from None
         tokens: list[Any] = []
         append = tokens.append
-        ignored = self.__ignored
-        suppress = self.__suppress
-        source = self.__tokens
         for i, char in enumerate(code):
-            if char in ignored:
-                continue
-            if (t := source.get(char)) is None:
-                if suppress:
+            if (t := lookup.get(char)) is None:
+                if suppress or char in lookup:
                     continue
-                return Err((i, char)) if with_positions else Err(char)
+                raise CrossandraTokenizationError(char, i)
             append((i, t) if with_positions else t)
-        return Ok(tokens)
+        return tokens
@@ -0,0 +1,508 @@
+"""Static analysis of rule patterns."""
+
+from __future__ import annotations
+
+import re
+import time
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Literal, TypeAlias
+
+from .exceptions import CrossandraValueError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .rule import PatternIssue
+
+try:
+    parser: Any = import_module("re._parser")
+except ImportError:  # Python 3.10
+    parser = import_module("sre_parse")
+
+FirstChars: TypeAlias = "tuple[frozenset[str], frozenset[str]] | None"
+
+# Exactly how `re` defines these categories for str patterns
+CATEGORIES: dict[str, Callable[[str], bool]] = {
+    "CATEGORY_DIGIT": str.isdecimal,
+    "CATEGORY_NOT_DIGIT": lambda c: not c.isdecimal(),
+    "CATEGORY_SPACE": str.isspace,
+    "CATEGORY_NOT_SPACE": lambda c: not c.isspace(),
+    "CATEGORY_WORD": lambda c: c.isalnum() or c == "_",
+    "CATEGORY_NOT_WORD": lambda c: not (c.isalnum() or c == "_"),
+}
+# Categories which match any non-ASCII byte in bytes patterns
+NEGATED_CATEGORIES = ("CATEGORY_NOT_DIGIT", "CATEGORY_NOT_SPACE", "CATEGORY_NOT_WORD")
+MAX_RANGE = 1024
+IssueKind: TypeAlias = Literal[
+    "nested-quantifier", "overlapping-alternation", "empty-match", "shadowed", "slow"
+]
+
+
+class UnknownFirstChars(Exception):  # noqa: N818
+    pass
+
+
+def first_chars(pattern: str, flags: int = 0) -> FirstChars:
+    """
+    Returns the characters that a non-empty match of `pattern` can start
+    with, as a set of characters and a set of `re` category names (e.g.
+    `CATEGORY_DIGIT` for `\\d`), or None if they can't be determined. The
+    result may be a superset of the actual characters.
+    """
+    try:
+        parsed = parser.parse(pattern, flags)
+    except re.error:
+        return None
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    chars: set[str] = set()
+    categories: set[str] = set()
+    try:
+        first_of_sequence(parsed, chars, categories)
+    except UnknownFirstChars:
+        return None
+    return frozenset(chars), frozenset(categories)
+
+
+def first_of_sequence(items: Any, chars: set[str], categories: set[str]) -> bool:
+    """
+    Adds the first characters of a sequence of parsed items to `chars` and
+    `categories`. Returns whether the sequence can match an empty string.
+    """
+    return all(first_of_item(op, av, chars, categories) for op, av in items)
+
+
+def first_of_set(items: Any, chars: set[str], categories: set[str]) -> None:
+    for op, av in items:
+        if op is parser.LITERAL:
+            chars.add(chr(av))
+        elif op is parser.RANGE and av[1] - av[0] <= MAX_RANGE:
+            chars.update(map(chr, range(av[0], av[1] + 1)))
+        elif op is parser.CATEGORY and str(av) in CATEGORIES:
+            categories.add(str(av))
+        else:
+            raise UnknownFirstChars
+
+
+def first_of_item(op: Any, av: Any, chars: set[str], categories: set[str]) -> bool:
+    if op is parser.LITERAL or op is parser.IN:
+        first_of_set(av if op is parser.IN else [(op, av)], chars, categories)
+        return False
+    if op is parser.SUBPATTERN:
+        _, add_flags, _, items = av
+        if add_flags & re.IGNORECASE:
+            raise UnknownFirstChars
+        return first_of_sequence(items, chars, categories)
+    if op is parser.BRANCH:
+        nullable = False
+        for items in av[1]:
+            if first_of_sequence(items, chars, categories):
+                nullable = True
+        return nullable
+    if op in REPEATS:
+        return first_of_sequence(av[2], chars, categories) or av[0] == 0
+    if op is getattr(parser, "ATOMIC_GROUP", None):
+        return first_of_sequence(av, chars, categories)
+    if op in (parser.AT, parser.ASSERT, parser.ASSERT_NOT):
+        # Zero-width, so the next item determines the first character
+        return True
+    raise UnknownFirstChars
+
+
+REPEATS = tuple(
+    getattr(parser, name)
+    for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(parser, name)
+)
+BACKTRACKING_REPEATS = (parser.MAX_REPEAT, parser.MIN_REPEAT)
+
+
+def can_start(first: FirstChars, char: str) -> bool:
+    """Returns whether a match described by `first` can start with `char`."""
+    if first is None:
+        return True
+    chars, categories = first
+    return char in chars or any(CATEGORIES[c](char) for c in categories)
+
+
+def can_start_bytes(first: FirstChars, byte: int) -> bool:
+    """
+    Returns whether a match described by `first` can start with `byte` when
+    the pattern is matched against UTF-8 encoded bytes.
+    """
+    if first is None:
+        return True
+    if byte < 0x80:  # noqa: PLR2004
+        return can_start(first, chr(byte))
+    chars, categories = first
+    # In bytes patterns, negated categories match any non-ASCII byte, and the
+    # other categories none
+    return any(c in categories for c in NEGATED_CATEGORIES) or any(
+        c.encode()[0] == byte for c in chars
+    )
+
+
+# Characters standing in for sets and categories when building inputs
+SAMPLES = {
+    "CATEGORY_DIGIT": "0",
+    "CATEGORY_NOT_DIGIT": "a",
+    "CATEGORY_SPACE": " ",
+    "CATEGORY_NOT_SPACE": "a",
+    "CATEGORY_WORD": "a",
+    "CATEGORY_NOT_WORD": " ",
+}
+# Characters used for checking whether first character sets overlap
+PROBES = "".join(map(chr, range(128))) + "\xa0\xe9\u0663\u2003\u4e00"
+MAX_FUZZ_LENGTH = 1 << 14
+MAX_PUMPS = 8
+
+
+def pattern_issues(pattern: str, flags: int = 0) -> list[tuple[IssueKind, str]]:
+    """
+    Looks for shapes known to cause catastrophic backtracking in a parsed
+    pattern, and checks whether it can match an empty string. Returns
+    `(kind, message)` pairs.
+    """
+    parsed = parser.parse(pattern, flags)
+    issues: list[tuple[IssueKind, str]] = []
+    find_backtracking(parsed, parsed.state, issues)
+    if parsed.getwidth()[0] == 0:
+        issues.append(
+            (
+                "empty-match",
+                "can match an empty string, which never advances the tokenizer",
+            )
+        )
+    return issues
+
+
+def raise_issues(issues: list[PatternIssue]) -> None:
+    """Raises a `CrossandraValueError` listing the issues, if there are any."""
+    if issues:
+        msg = "\n".join(f"{i.rule.pattern!r}: {i.message}" for i in issues)
+        raise CrossandraValueError(msg)
+
+
+def has_assertions(pattern: str, flags: int = 0) -> bool:
+    """
+    Returns whether a pattern contains anchors or lookarounds, i.e. whether
+    a match of some input might not also be a match of its extensions.
+    """
+
+    def walk(items: Any) -> bool:
+        for op, av in items:
+            if op in (parser.AT, parser.ASSERT, parser.ASSERT_NOT):
+                return True
+            if op in REPEATS:
+                found = walk(av[2])
+            elif op is parser.SUBPATTERN:
+                found = walk(av[3])
+            elif op is parser.BRANCH:
+                found = any(walk(b) for b in av[1])
+            elif op is getattr(parser, "ATOMIC_GROUP", None):
+                found = walk(av)
+            else:
+                continue
+            if found:
+                return True
+        return False
+
+    return walk(parser.parse(pattern, flags))
+
+
+def bytes_issue(pattern: bytes, flags: int = 0) -> str | None:
+    """
+    Returns why a UTF-8 encoded str pattern can match part of a multi-byte
+    character when matched against bytes, or None if it can't.
+    """
+
+    def non_ascii_set(op: Any, av: Any) -> bool:
+        return op is parser.IN and any(
+            (o is parser.LITERAL and a >= 0x80) or (o is parser.RANGE and a[1] >= 0x80)  # noqa: PLR2004
+            for o, a in av
+        )
+
+    def any_byte(op: Any, av: Any) -> bool:
+        if op is parser.ANY or op is parser.NOT_LITERAL:
+            return True
+        return op is parser.IN and any(
+            o is parser.NEGATE
+            or (o is parser.CATEGORY and str(a) in NEGATED_CATEGORIES)
+            for o, a in av
+        )
+
+    def walk(items: Any) -> str | None:
+        for op, av in items:
+            if non_ascii_set(op, av):
+                return "non-ASCII characters in sets match single bytes"
+            if any_byte(op, av):
+                return (
+                    "'.', negated sets and \\D, \\S, \\W match single bytes unless "
+                    "repeated without an upper bound"
+                )
+            if op in REPEATS:
+                item: Any = av[2][0] if len(av[2]) == 1 else (None, None)
+                if item[0] is parser.LITERAL and item[1] >= 0x80:  # noqa: PLR2004
+                    return (
+                        "quantifiers after non-ASCII characters only repeat "
+                        "their last byte"
+                    )
+                if (
+                    av[1] is parser.MAXREPEAT
+                    and any_byte(*item)
+                    and not non_ascii_set(*item)
+                ):
+                    continue
+                issue = walk(av[2])
+            elif op is parser.SUBPATTERN:
+                issue = walk(av[3])
+            elif op is parser.BRANCH or op is parser.GROUPREF_EXISTS:
+                branches = av[1] if op is parser.BRANCH else filter(None, av[1:])
+                issue = next(filter(None, map(walk, branches)), None)
+            elif op in (parser.ASSERT, parser.ASSERT_NOT):
+                issue = walk(av[1])
+            elif op is getattr(parser, "ATOMIC_GROUP", None):
+                issue = walk(av)
+            else:
+                continue
+            if issue:
+                return issue
+        return None
+
+    return walk(parser.parse(pattern, flags))
+
+
+def find_backtracking(
+    items: Any, state: Any, issues: list[tuple[IssueKind, str]]
+) -> None:
+    """
+    Reports repeats whose iterations can end in more than one place, with
+    the rest of the input also matching the start of the next iteration (as
+    in `(a+)+`, `(\\w+\\s?)*`, or `(a|aa)*`), and repeated alternatives of
+    different lengths which can start with the same character. Possessive
+    repeats and atomic groups never backtrack.
+    """
+    for op, av in items:
+        if op in BACKTRACKING_REPEATS:
+            low, high, body = av
+            if high > 1 and high != low:
+                find_ambiguous_tail(body, sequence_first_chars(body), state, issues)
+                issues.extend(
+                    (
+                        "overlapping-alternation",
+                        f"repeated alternatives matching e.g. {a!r} and {b!r} "
+                        "can start with the same character",
+                    )
+                    for a, b in overlapping_branches(body, state)
+                )
+            find_backtracking(body, state, issues)
+        elif op is parser.SUBPATTERN:
+            find_backtracking(av[3], state, issues)
+        elif op is parser.BRANCH:
+            for branch in av[1]:
+                find_backtracking(branch, state, issues)
+        elif op in (parser.ASSERT, parser.ASSERT_NOT):
+            find_backtracking(av[1], state, issues)
+
+
+def find_ambiguous_tail(
+    items: Any, first: FirstChars, state: Any, issues: list[tuple[IssueKind, str]]
+) -> bool:
+    """
+    Looks for an item at the end of a repeated sequence (followed only by
+    optional items) which can either stop or go on matching characters that
+    the next iteration, starting with `first`, can also start with. Reports
+    it and returns True if one is found.
+    """
+    for i in reversed(range(len(items))):
+        op, av = items[i]
+        if op in BACKTRACKING_REPEATS and av[0] != av[1]:
+            # Unknown characters are assumed to overlap, as nested
+            # quantifiers are suspicious either way
+            inner = sequence_first_chars(av[2])
+            if first is None or inner is None or overlap(first, inner):
+                issues.append(
+                    (
+                        "nested-quantifier",
+                        f"a repeat matching e.g. {describe(av[2])!r} is itself "
+                        "repeated, so an input can be split between the "
+                        "repetitions in exponentially many ways",
+                    )
+                )
+                return True
+        elif op is parser.SUBPATTERN:
+            if find_ambiguous_tail(av[3], first, state, issues):
+                return True
+        elif op is parser.BRANCH:
+            branches = av[1]
+            longer = [b for b in branches if not is_nullable(b, state)]
+            empty = len(branches) - len(longer)
+            if empty > 1 or (
+                empty and any(overlap(first, sequence_first_chars(b)) for b in longer)
+            ):
+                issues.append(
+                    (
+                        "overlapping-alternation",
+                        "a repeated alternation can match the same input in more "
+                        "than one way, so an input can be split between the "
+                        "repetitions in exponentially many ways",
+                    )
+                )
+                return True
+            if any(find_ambiguous_tail(b, first, state, issues) for b in branches):
+                return True
+        if not is_nullable(items[i : i + 1], state):
+            break
+    return False
+
+
+def is_nullable(items: Any, state: Any) -> bool:
+    return int(parser.SubPattern(state, list(items)).getwidth()[0]) == 0
+
+
+def overlapping_branches(items: Any, state: Any) -> list[tuple[str, str]]:
+    """
+    Returns sample matches of the branches of different widths in a repeated
+    sequence which can start with the same character, considering only
+    alternations which aren't preceded by a required item.
+    """
+    found: list[tuple[str, str]] = []
+    for i, (op, av) in enumerate(items):
+        if op is parser.BRANCH:
+            branches = av[1]
+            firsts = [sequence_first_chars(b) for b in branches]
+            widths = [parser.SubPattern(state, list(b)).getwidth() for b in branches]
+            found.extend(
+                (describe(branches[a]), describe(branches[b]))
+                for a in range(len(branches))
+                for b in range(a + 1, len(branches))
+                if widths[a] != widths[b] and overlap(firsts[a], firsts[b])
+            )
+        elif op is parser.SUBPATTERN:
+            found.extend(overlapping_branches(av[3], state))
+        if not is_nullable(items[i : i + 1], state):
+            break
+    return found
+
+
+def sequence_first_chars(items: Any) -> FirstChars:
+    """Like `first_chars`, but for a sequence of parsed items."""
+    chars: set[str] = set()
+    categories: set[str] = set()
+    try:
+        first_of_sequence(items, chars, categories)
+    except UnknownFirstChars:
+        return None
+    return frozenset(chars), frozenset(categories)
+
+
+def overlap(a: FirstChars, b: FirstChars) -> bool:
+    """Returns whether two known first character sets share a character."""
+    if a is None or b is None:
+        return False
+    return (
+        any(can_start(b, c) for c in a[0])
+        or any(can_start(a, c) for c in b[0])
+        or any(can_start(a, c) and can_start(b, c) for c in PROBES)
+    )
+
+
+def describe(items: Any) -> str:
+    """Returns a short sample match of parsed items."""
+    return "".join(sample(items))[:10]
+
+
+def sample(items: Any) -> list[str]:
+    """Returns characters standing in for each item of a parsed pattern."""
+    out: list[str] = []
+    for op, av in items:
+        if op is parser.LITERAL:
+            out.append(chr(av))
+        elif op is parser.IN:
+            out.extend(sample_set(av)[:1])
+        elif op is parser.ANY:
+            out.append("a")
+        elif op in REPEATS:
+            out.extend(sample(av[2]) * max(av[0], 1))
+        elif op is parser.SUBPATTERN:
+            out.extend(sample(av[3]))
+        elif op is parser.BRANCH:
+            out.extend(sample(av[1][0]))
+        elif op is getattr(parser, "ATOMIC_GROUP", None):
+            out.extend(sample(av))
+    return out
+
+
+def sample_set(items: Any) -> list[str]:
+    if items and items[0][0] is parser.NEGATE:
+        return []
+    out = []
+    for op, av in items:
+        if op is parser.LITERAL:
+            out.append(chr(av))
+        elif op is parser.RANGE:
+            out.append(chr(av[0]))
+        elif op is parser.CATEGORY and str(av) in SAMPLES:
+            out.append(SAMPLES[str(av)])
+    return out
+
+
+def pumps(pattern: str, flags: int) -> list[str]:
+    """
+    Returns strings to repeat when building adversarial inputs for a pattern:
+    every character the pattern mentions, and all of them in order.
+    """
+    parsed = parser.parse(pattern, flags)
+    chars: list[str] = []
+
+    def collect(items: Any) -> None:
+        for op, av in items:
+            if op is parser.IN:
+                chars.extend(sample_set(av))
+            elif op is parser.LITERAL:
+                chars.append(chr(av))
+            elif op is parser.ANY:
+                chars.append("a")
+            elif op in REPEATS:
+                collect(av[2])
+            elif op is parser.SUBPATTERN:
+                collect(av[3])
+            elif op is parser.BRANCH:
+                for branch in av[1]:
+                    collect(branch)
+            elif op is getattr(parser, "ATOMIC_GROUP", None):
+                collect(av)
+            elif op in (parser.ASSERT, parser.ASSERT_NOT):
+                collect(av[1])
+
+    collect(parsed)
+    unique = list(dict.fromkeys(chars))
+    return [*unique[: MAX_PUMPS - 1], "".join(unique)] if unique else ["a"]
+
+
+def fuzz_pattern(compiled: re.Pattern[str], budget: float) -> str | None:
+    """
+    Times matching the pattern against inputs made of a repeated string
+    followed by a character the pattern is unlikely to accept, growing them
+    until matching becomes slow or `budget` seconds run out. Returns a
+    description of the first slow input, or None.
+    """
+    deadline = time.perf_counter() + budget
+    for pump in pumps(compiled.pattern, compiled.flags):
+        n, elapsed = 1, 0.0
+        while len(pump) * n <= MAX_FUZZ_LENGTH:
+            # Stop before an input which might blow through the budget
+            if elapsed * 4 > deadline - time.perf_counter():
+                return None
+            text = pump * n + "\0"
+            start = time.perf_counter()
+            compiled.match(text)
+            elapsed = time.perf_counter() - start
+            # Linear matching takes well under a microsecond per character
+            if elapsed > 0.01 + len(text) * 1e-5:
+                return (
+                    f"matching {len(text)} characters ({text[:12]!r}...) "
+                    f"took {elapsed:.3f}s"
+                )
+            n = n + 1 if n < 32 else n * 2  # noqa: PLR2004
+    return None
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, TypeAlias, final
+
+from .exceptions import CrossandraIndentationError
+from .token import Token
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from enum import Enum
+
+    from .lib import Crossandra, Kind, Source
+
+Stage: TypeAlias = "Callable[[Iterator[Any]], Iterator[Any]]"
+
+
+@final
+class Filter:
+    """A stage keeping only the tokens for which `predicate` returns True."""
+
+    __slots__ = ("__predicate",)
+
+    def __init__(self, predicate: Callable[[Any], bool]) -> None:
+        self.__predicate = predicate
+
+    def __call__(self, tokens: Iterator[Any]) -> Iterator[Any]:
+        return filter(self.__predicate, tokens)
+
+
+@final
+class Map:
+    """A stage replacing every token with the result of `function`."""
+
+    __slots__ = ("__function",)
+
+    def __init__(self, function: Callable[[Any], Any]) -> None:
+        self.__function = function
+
+    def __call__(self, tokens: Iterator[Any]) -> Iterator[Any]:
+        return map(self.__function, tokens)
+
+
+@final
+class Indent:
+    """
+    A stage inserting `indent` and `dedent` tokens where the indentation of
+    a line changes, like Python's tokenizer. Lines end with tokens of the
+    `newline` kind, and a line's indentation is the distance between the end
+    of the previous newline token and the line's first token (so a tab
+    counts as a single character). Lines without any other tokens don't
+    affect the indentation. Remaining levels are closed at the end of the
+    input.
+
+    The inserted tokens are empty and positioned at the line's first token.
+    Raises `CrossandraIndentationError` when a line is dedented to a level
+    not matching any enclosing one.
+    """
+
+    __slots__ = ("__dedent", "__indent", "__newline")
+
+    def __init__(self, newline: Kind, indent: Enum, dedent: Enum) -> None:
+        self.__newline = newline
+        self.__indent = indent
+        self.__dedent = dedent
+
+    def __call__(self, tokens: Iterator[Token]) -> Iterator[Token]:
+        newline, indent, dedent = self.__newline, self.__indent, self.__dedent
+        levels = [0]
+        # The start of the current line until its first token is found
+        line_start: int | None = 0
+        end = 0
+        for token in tokens:
+            if token.kind is newline:
+                line_start = token.end
+            elif line_start is not None:
+                width, start = token.start - line_start, token.start
+                if width > levels[-1]:
+                    levels.append(width)
+                    yield Token(indent, indent, start, start)
+                while width < levels[-1]:
+                    levels.pop()
+                    yield Token(dedent, dedent, start, start)
+                if width != levels[-1]:
+                    raise CrossandraIndentationError(start)
+                line_start = None
+            end = token.end
+            yield token
+        for _ in levels[1:]:
+            yield Token(dedent, dedent, end, end)
+
+
+@final
+class Pipeline:
+    """
+    Runs the tokens of a Crossandra tokenizer through a chain of
+    post-processing stages. Takes the following arguments:
+    - `tokenizer`: the tokenizer producing the tokens
+    - `stages`: callables taking an iterator of tokens and returning an
+      iterator of processed tokens (e.g. `Filter`, `Map`, `Indent`, or
+      generator functions), applied in order
+
+    The first stage receives `Token` objects. Stages are chained lazily, so
+    each token passes through all of them before the next one is produced,
+    and no intermediate lists are built.
+    """
+
+    __slots__ = ("__stages", "__tokenizer")
+
+    def __init__(self, tokenizer: Crossandra, stages: Iterable[Stage]) -> None:
+        self.__tokenizer = tokenizer
+        self.__stages = tuple(stages)
+
+    def tokenize(self, code: Source, *, decode: bool = False) -> list[Any]:
+        """Tokenizes the input string and returns the processed tokens."""
+        return list(self.apply(self.__tokenizer.iter_tokens(code, decode=decode)))
+
+    def tokenize_stream(
+        self,
+        chunks: Iterable[Source],
+        *,
+        decode: bool = False,
+        max_buffer: int = 1024 * 1024,
+    ) -> Iterator[Any]:
+        """
+        Lazily tokenizes an input split into chunks like
+        `Crossandra.tokenize_stream`, yielding the processed tokens.
+        """
+        return self.apply(
+            self.__tokenizer.tokenize_stream(
+                chunks, decode=decode, max_buffer=max_buffer, output="tokens"
+            )
+        )
+
+    def apply(self, tokens: Iterable[Token]) -> Iterator[Any]:
+        """
+        Lazily runs already produced tokens (e.g. from `Crossandra.feed`)
+        through the stages.
+        """
+        out: Iterator[Any] = iter(tokens)
+        for stage in self.__stages:
+            out = stage(out)
+        return out
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from _thread import allocate_lock
+from typing import TYPE_CHECKING, Any, TypeVar, final
+from weakref import WeakValueDictionary
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+    from enum import Enum
+
+    from .lib import BytesTables, Tree
+    from .patterns import FirstChars
+    from .rule import Rule
+
+# This module is not compiled with mypyc, as instances of native classes
+# can't be weakly referenced
+
+
+@final
+class EnumCore:
+    """
+    The compiled enum tokens of a tokenizer. Shared between all tokenizers
+    created with the same enum and options, and never modified after
+    construction (except for the bytes tables, which are built on first use
+    and only hold what is derived from the enum).
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "bytes_tables",
+        "fast",
+        "keys",
+        "maxlen",
+        "tokens",
+        "tree",
+    )
+
+    def __init__(
+        self, tokens: dict[str, Enum], keys: tuple[str, ...], tree: Tree, *, fast: bool
+    ) -> None:
+        self.tokens = tokens
+        self.keys = keys
+        self.maxlen = max(map(len, keys or ("1",)))
+        self.tree = tree
+        self.fast = fast
+        self.bytes_tables: BytesTables | None = None
+
+
+@final
+class RuleDispatch:
+    """
+    The first characters of a tokenizer's rules, and the rules which can
+    match at each character (or byte), filled in lazily. Shared between all
+    tokenizers created with the same rule objects in longest match mode.
+    """
+
+    __slots__ = ("__weakref__", "candidates", "first_chars")
+
+    def __init__(self, first_chars: tuple[tuple[Rule[Any], FirstChars], ...]) -> None:
+        self.first_chars = first_chars
+        self.candidates: dict[str | int, tuple[Rule[Any], ...]] = {}
+
+
+T = TypeVar("T", EnumCore, RuleDispatch)
+
+# Entries are dropped once no tokenizer uses them
+ENUM_CORES: WeakValueDictionary[Hashable, EnumCore] = WeakValueDictionary()
+RULE_DISPATCHES: WeakValueDictionary[Hashable, RuleDispatch] = WeakValueDictionary()
+# threading is slow to import, and only its lock is needed
+LOCK = allocate_lock()
+
+
+def intern(
+    registry: WeakValueDictionary[Hashable, T], key: Hashable, build: Callable[[], T]
+) -> T:
+    """
+    Returns the registry entry for `key`, building and adding it if there
+    is none.
+    """
+    with LOCK:
+        if (entry := registry.get(key)) is None:
+            entry = registry[key] = build()
+    return entry
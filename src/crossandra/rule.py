@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, NamedTuple, TypeVar
 
 from .exceptions import CrossandraValueError
+from .patterns import (
+    IssueKind,
+    bytes_issue,
+    fuzz_pattern,
+    pattern_issues,
+    raise_issues,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterator
@@ -34,6 +40,7 @@ class Rule(Generic[T]):
     """
 
     __slots__ = (
+        "__compiled_bytes_pattern",
         "__compiled_pattern",
         "__converter",
         "__flags",
@@ -55,7 +62,8 @@ class Rule(Generic[T]):
         self.__ignore = ignore
         pattern_str = pattern.pattern if isinstance(pattern, re.Pattern) else pattern
         self.__pattern = pattern_str
-        self.__compiled_pattern = re.compile(pattern_str, flags)
+        self.__compiled_pattern: re.Pattern[str] | None = None
+        self.__compiled_bytes_pattern: re.Pattern[bytes] | None = None
         self.__converter = converter
         self.__flags = flags
 
@@ -90,6 +98,35 @@ class Rule(Generic[T]):
             return RuleGroup((self, *other.rules))
         return NotImplemented
 
+    def compile(self) -> re.Pattern[str]:
+        """
+        Compiles the Rule's pattern (unless it's already compiled) and returns
+        it. Patterns are compiled on first use or when the Rule is passed to
+        a Crossandra tokenizer, whichever comes first.
+        """
+        if (pattern := self.__compiled_pattern) is None:
+            pattern = re.compile(self.__pattern, self.__flags)
+            self.__compiled_pattern = pattern
+        return pattern
+
+    def analyze(self, *, fuzz: float = 0.0, strict: bool = False) -> list[PatternIssue]:
+        """
+        Inspects the Rule's pattern for shapes prone to catastrophic
+        backtracking and for empty matches, and returns the issues found.
+        When `fuzz` is positive, matching is also timed on adversarial inputs
+        for up to `fuzz` seconds. With `strict=True`, a `CrossandraValueError`
+        is raised instead if any issues are found.
+        """
+        issues = [
+            PatternIssue(self, kind, message)
+            for kind, message in pattern_issues(self.__pattern, self.__flags)
+        ]
+        if fuzz > 0 and (slow := fuzz_pattern(self.compile(), fuzz)):
+            issues.append(PatternIssue(self, "slow", slow))
+        if strict:
+            raise_issues(issues)
+        return issues
+
     def apply(self, target: str) -> tuple[T | str | Ignored, int] | NotApplied:
         """
         Checks if `target` matches the Rule's pattern. If it does,
@@ -101,7 +138,7 @@ class Rule(Generic[T]):
         and the length of the matched substring. If it doesn't, returns
         the `NotApplied` sentinel.
         """
-        if m := self.__compiled_pattern.match(target):
+        if m := (self.__compiled_pattern or self.compile()).match(target):
             end = m.span()[1]
             if self.__ignore:
                 return IGNORED, end
@@ -112,15 +149,78 @@ class Rule(Generic[T]):
             return conv(matched), end
         return NOT_APPLIED
 
+    def match(self, target: str) -> int | NotApplied:
+        """
+        Checks if `target` matches the Rule's pattern. If it does, returns
+        the length of the matched substring (without calling the converter).
+        If it doesn't, returns the `NotApplied` sentinel.
+        """
+        if m := (self.__compiled_pattern or self.compile()).match(target):
+            return m.end()
+        return NOT_APPLIED
+
+    def match_bytes(self, target: bytes | bytearray | memoryview) -> int | NotApplied:
+        """
+        Checks if `target` matches the Rule's pattern encoded as UTF-8 (the
+        pattern is compiled for bytes on first use). If it does, returns the
+        length of the matched substring in bytes. If it doesn't, returns the
+        `NotApplied` sentinel. Raises a `CrossandraValueError` if the pattern
+        could match part of a multi-byte character.
+        """
+        if (pattern := self.__compiled_bytes_pattern) is None:
+            try:
+                pattern = re.compile(
+                    self.__pattern.encode(), self.__flags & ~re.UNICODE
+                )
+            except re.error as e:
+                msg = f"cannot match {self.__pattern!r} against bytes: {e}"
+                raise CrossandraValueError(msg) from None
+            if issue := bytes_issue(pattern.pattern, pattern.flags):
+                msg = f"cannot match {self.__pattern!r} against bytes: {issue}"
+                raise CrossandraValueError(msg)
+            self.__compiled_bytes_pattern = pattern
+        if m := pattern.match(target):
+            return m.end()
+        return NOT_APPLIED
+
+    def convert(self, matched: str) -> T | str:
+        """
+        Returns the result of calling the Rule's converter on `matched`, or
+        `matched` itself if the Rule has no converter.
+        """
+        conv = self.__converter
+        if conv is None:
+            return matched
+        return conv(matched)
+
 
-@dataclass(frozen=True)
 class RuleGroup:
     """
     Used for storing multiple Rules in one object. Can be constructed
     by passing in a tuple of rules or by ORing (`|`) two or more rules.
     """
 
-    rules: tuple[Rule[Any], ...]
+    # Not a dataclass, as importing dataclasses (and inspect) would make up
+    # most of the time taken by `import crossandra`
+    __slots__ = ("__rules",)
+
+    def __init__(self, rules: tuple[Rule[Any], ...]) -> None:
+        self.__rules = rules
+
+    def __repr__(self) -> str:
+        return f"RuleGroup(rules={self.__rules!r})"
+
+    def __hash__(self) -> int:
+        return hash((self.__rules,))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RuleGroup):
+            return self.__rules == other.rules
+        return NotImplemented
+
+    @property
+    def rules(self) -> tuple[Rule[Any], ...]:
+        return self.__rules
 
     def apply(self, target: str) -> tuple[Any | str | Ignored, int] | NotApplied:
         """
@@ -141,3 +241,14 @@ class RuleGroup:
         if isinstance(other, Rule):
             return RuleGroup((*self.rules, other))
         return NotImplemented
+
+
+class PatternIssue(NamedTuple):
+    """
+    A problem found in a rule by `Rule.analyze` or `Crossandra.analyze`.
+    `kind` tells what the problem is and `message` describes it.
+    """
+
+    rule: Rule[Any]
+    kind: IssueKind
+    message: str
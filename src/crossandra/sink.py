@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import mmap
+from array import array
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Protocol, final
+
+from .exceptions import CrossandraValueError
+from .lib import kind_indices
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable, Iterator
+    from types import TracebackType
+
+    from .lib import Crossandra, Kind
+
+MAGIC = b"CRTOKENS"
+# The magic bytes followed by the tokenizer's fingerprint
+HEADER_SIZE = len(MAGIC) + 32
+
+
+class Sink(Protocol):
+    """
+    Receives the tokens found by `Crossandra.tokenize_into` in batches of
+    `(start, length, kind)` spans.
+    """
+
+    def write(self, spans: list[tuple[int, int, Kind]], /) -> None: ...
+
+    def flush(self) -> None: ...
+
+
+@final
+class FileSink:
+    """
+    A sink writing tokens to a binary file as fixed-width records of three
+    unsigned 64-bit integers (kind index, start, length) in native byte
+    order, after a header identifying the tokenizer. `file` must be opened
+    for writing in binary mode and is not closed by the sink. Use
+    `TokenFile` to read the tokens back.
+    """
+
+    __slots__ = ("__file", "__indices")
+
+    def __init__(self, file: IO[bytes], tokenizer: Crossandra) -> None:
+        self.__file = file
+        self.__indices = kind_indices(tokenizer.kinds)
+        file.write(MAGIC + bytes.fromhex(tokenizer.fingerprint))
+
+    def write(self, spans: list[tuple[int, int, Kind]]) -> None:
+        indices = self.__indices
+        records = array("Q")
+        for start, length, kind in spans:
+            records.extend((indices[kind], start, length))
+        records.tofile(self.__file)
+
+    def flush(self) -> None:
+        self.__file.flush()
+
+
+@final
+class ArraySink:
+    """
+    A sink collecting tokens into `array("Q")` chunks of up to `chunk_size`
+    tokens, stored as consecutive (kind index, start, length) triples. Full
+    chunks (and the last, partial one on `flush`) are passed to `rotate`,
+    after which the sink starts a new chunk.
+    """
+
+    __slots__ = ("__chunk", "__chunk_size", "__indices", "__rotate")
+
+    def __init__(
+        self,
+        tokenizer: Crossandra,
+        rotate: Callable[[array[int]], Any],
+        *,
+        chunk_size: int = 64 * 1024,
+    ) -> None:
+        self.__indices = kind_indices(tokenizer.kinds)
+        self.__rotate = rotate
+        self.__chunk_size = chunk_size * 3
+        self.__chunk = array("Q")
+
+    def write(self, spans: list[tuple[int, int, Kind]]) -> None:
+        indices = self.__indices
+        chunk, size = self.__chunk, self.__chunk_size
+        for start, length, kind in spans:
+            chunk.extend((indices[kind], start, length))
+            if len(chunk) == size:
+                self.__rotate(chunk)
+                chunk = self.__chunk = array("Q")
+
+    def flush(self) -> None:
+        if self.__chunk:
+            self.__rotate(self.__chunk)
+            self.__chunk = array("Q")
+
+
+@final
+class CallbackSink:
+    """A sink calling `callback` with the start, length, and kind of every token."""
+
+    __slots__ = ("__callback",)
+
+    def __init__(self, callback: Callable[[int, int, Kind], Any]) -> None:
+        self.__callback = callback
+
+    def write(self, spans: list[tuple[int, int, Kind]]) -> None:
+        callback = self.__callback
+        for start, length, kind in spans:
+            callback(start, length, kind)
+
+    def flush(self) -> None:
+        pass
+
+
+@final
+class TokenFile:
+    """
+    A memory-mapped file of tokens written by `FileSink`, supporting `len`,
+    iteration, and random access by index. Tokens are `(start, length,
+    kind)` triples. `tokenizer` must have the same configuration (see
+    `Crossandra.fingerprint`) as the one used to write the file.
+    """
+
+    __slots__ = ("__kinds", "__mmap", "__records")
+
+    def __init__(self, path: str | os.PathLike[str], tokenizer: Crossandra) -> None:
+        with Path(path).open("rb") as f:
+            header = f.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE or header[: len(MAGIC)] != MAGIC:
+                msg = f"{str(path)!r} is not a token file"
+                raise CrossandraValueError(msg)
+            if header[len(MAGIC) :] != bytes.fromhex(tokenizer.fingerprint):
+                msg = f"{str(path)!r} was written by a differently configured tokenizer"
+                raise CrossandraValueError(msg)
+            # The mapping stays valid after the file is closed
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__kinds = tokenizer.kinds
+        self.__records = memoryview(self.__mmap)[HEADER_SIZE:].cast("Q")
+
+    def __len__(self) -> int:
+        return len(self.__records) // 3
+
+    def __getitem__(self, index: int) -> tuple[int, int, Kind]:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            msg = "token index out of range"
+            raise IndexError(msg)
+        records, i = self.__records, index * 3
+        return records[i + 1], records[i + 2], self.__kinds[records[i]]
+
+    def __iter__(self) -> Iterator[tuple[int, int, Kind]]:
+        records, kinds = self.__records, self.__kinds
+        for i in range(0, len(records) - 2, 3):
+            yield records[i + 1], records[i + 2], kinds[records[i]]
+
+    def close(self) -> None:
+        """Unmaps the file. Tokens can't be accessed afterwards."""
+        self.__records.release()
+        self.__mmap.close()
+
+    def __enter__(self) -> TokenFile:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from pathlib import Path
+
+
+class StreamState(NamedTuple):
+    """
+    The state of an incremental tokenization (see `Crossandra.feed`).
+    `offset` is the position of `carry` in the whole input, and `carry` is
+    the tail of the input fed so far which hasn't been tokenized yet (as it
+    might continue in the next chunk).
+    """
+
+    offset: int = 0
+    carry: str | bytes = ""
+
+
+class FollowState(NamedTuple):
+    """
+    The state of reading a file (see `Crossandra.follow` and
+    `Crossandra.tokenize_file`). `position` is the number of bytes read from
+    the file, and `stream` is the state of the incremental tokenization of
+    what has been read.
+    """
+
+    position: int = 0
+    stream: StreamState = StreamState(carry=b"")
+
+
+def follow_file(
+    feed: Callable[[bytes, StreamState], tuple[list[Any], StreamState]],
+    path: str | os.PathLike[str],
+    state: FollowState,
+    *,
+    chunk_size: int,
+    interval: float,
+    timeout: float | None,
+) -> Iterator[tuple[list[Any], FollowState]]:
+    """
+    Yields the tokens read from a growing file along with the state to resume
+    from (see `Crossandra.follow`). `feed` flushes the input when passed an
+    empty chunk.
+    """
+    # Only imported here, as pathlib is slow to import
+    from pathlib import Path
+
+    file = Path(path)
+    position, stream = state
+    # The (device, inode) of the followed file, to notice it being replaced
+    followed: tuple[int, int] | None = None
+    idle_since = time.monotonic()
+    while True:
+        try:
+            chunk, stat = read_at(file, position, chunk_size)
+        except FileNotFoundError:
+            if followed is None:
+                raise
+            # Not recreated yet, e.g. in the middle of a rotation
+            chunk, stat = b"", None
+        if stat is not None:
+            identity = (stat.st_dev, stat.st_ino)
+            if stat.st_size < position or followed not in (None, identity):
+                if followed is not None:
+                    # Truncated or replaced by another file
+                    tokens, _ = feed(b"", stream)
+                    yield tokens, FollowState()
+                # Otherwise, truncated since the state was saved
+                position, stream = FollowState()
+                followed = identity
+                continue
+            followed = identity
+        if chunk:
+            position += len(chunk)
+            tokens, stream = feed(chunk, stream)
+            yield tokens, FollowState(position, stream)
+            idle_since = time.monotonic()
+        elif timeout is not None and time.monotonic() - idle_since >= timeout:
+            return
+        else:
+            time.sleep(interval)
+
+
+def read_file(
+    feed: Callable[[bytes, StreamState], tuple[list[Any], StreamState]],
+    path: str | os.PathLike[str],
+    state: FollowState,
+    *,
+    chunk_size: int,
+    stop: int | None,
+) -> Iterator[tuple[list[Any], FollowState]]:
+    """
+    Yields the tokens read from a file along with the state to resume from
+    (see `Crossandra.tokenize_file`). `feed` flushes the input when passed an
+    empty chunk.
+    """
+    position, stream = state
+    with open(path, "rb") as f:  # noqa: PTH123  (pathlib is slow to import)
+        f.seek(position)
+        while stop is None or position < stop:
+            size = chunk_size if stop is None else min(chunk_size, stop - position)
+            if not (chunk := f.read(size)):
+                tokens, stream = feed(b"", stream)
+                yield tokens, FollowState(position, stream)
+                return
+            position += len(chunk)
+            tokens, stream = feed(chunk, stream)
+            yield tokens, FollowState(position, stream)
+
+
+def read_at(file: Path, position: int, size: int) -> tuple[bytes, os.stat_result]:
+    """
+    Reads up to `size` bytes of `file` from `position`, along with the status
+    of the file. The file is closed right away, as open files can't be renamed
+    or replaced on Windows (e.g. by log rotation).
+    """
+    with file.open("rb") as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size < position:
+            return b"", stat
+        f.seek(position)
+        return f.read(size), stat
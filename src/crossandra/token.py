@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Generic, NamedTuple, TypeVar, final
+
+if TYPE_CHECKING:
+    from .rule import Rule
+
+T = TypeVar("T")
+_UNSET: Any = object()
+
+
+class InvalidSpan(NamedTuple):
+    """
+    A run of unknown characters reported by `Crossandra.tokenize_with_errors`,
+    spanning from `start` (inclusive) to `end` (exclusive).
+    """
+
+    start: int
+    end: int
+    text: str | bytes
+
+
+@final
+class LazyValue(Generic[T]):
+    """
+    A deferred token value produced by `Crossandra.tokenize(output="lazy")`.
+    Stores the source string and the span matched by `rule`; the Rule's
+    converter is only called when `value` is first accessed, and its result
+    is cached afterwards.
+
+    For bytes sources, `text` is a `memoryview` slice of the source, which is
+    decoded as UTF-8 before being passed to the converter (or when `decode`
+    is True).
+    """
+
+    __slots__ = ("__decode", "__end", "__rule", "__source", "__start", "__value")
+
+    def __init__(
+        self,
+        rule: Rule[T],
+        source: str | memoryview,
+        start: int,
+        end: int,
+        *,
+        decode: bool = False,
+    ) -> None:
+        self.__rule = rule
+        self.__source = source
+        self.__start = start
+        self.__end = end
+        self.__decode = decode
+        self.__value: Any = _UNSET
+
+    @property
+    def rule(self) -> Rule[T]:
+        return self.__rule
+
+    @property
+    def start(self) -> int:
+        return self.__start
+
+    @property
+    def end(self) -> int:
+        return self.__end
+
+    @property
+    def text(self) -> str | memoryview:
+        """The matched substring."""
+        return self.__source[self.__start : self.__end]
+
+    @property
+    def value(self) -> T | str | memoryview:
+        """The result of calling the Rule's converter on the matched substring."""
+        if self.__value is _UNSET:
+            text = self.text
+            if isinstance(text, str):
+                self.__value = self.__rule.convert(text)
+            elif self.__decode or self.__rule.converter is not None:
+                self.__value = self.__rule.convert(str(text, "utf-8"))
+            else:
+                self.__value = text
+        return self.__value  # type: ignore[no-any-return]
+
+    def __repr__(self) -> str:
+        return f"LazyValue({self.__rule.pattern!r}, {self.text!r})"
+
+
+@final
+class Token:
+    """
+    A token produced by `Crossandra.tokenize(output="tokens")`. `kind` is
+    the enum member or the Rule that matched, `value` is the token's value
+    (the enum member itself for enum tokens), and `start` and `end` delimit
+    the matched substring in the input.
+    """
+
+    __slots__ = ("__end", "__kind", "__start", "__value")
+
+    def __init__(
+        self, kind: Enum | Rule[Any], value: Any, start: int, end: int
+    ) -> None:
+        self.__kind = kind
+        self.__value = value
+        self.__start = start
+        self.__end = end
+
+    @property
+    def kind(self) -> Enum | Rule[Any]:
+        return self.__kind
+
+    @property
+    def value(self) -> Any:
+        return self.__value
+
+    @property
+    def start(self) -> int:
+        return self.__start
+
+    @property
+    def end(self) -> int:
+        return self.__end
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Token):
+            return (self.__kind, self.__value, self.__start, self.__end) == (
+                other.kind,
+                other.value,
+                other.start,
+                other.end,
+            )
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.__kind, self.__start, self.__end))
+
+    def __repr__(self) -> str:
+        kind = self.__kind
+        name = repr(kind) if isinstance(kind, Enum) else f"Rule({kind.pattern!r})"
+        return f"Token({name}, {self.__value!r}, {self.__start}, {self.__end})"
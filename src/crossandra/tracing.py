@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from time import perf_counter
+from typing import TYPE_CHECKING, Protocol
+
+from .exceptions import CrossandraValueError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .lib import Crossandra, Kind
+
+
+class Tracer(Protocol):
+    """
+    Receives events from `Crossandra.tokenize` (including through
+    `tokenize_lines` and `tokenize_many`) while installed with `set_tracer`.
+    Sizes are in characters for strings and bytes otherwise, and times are
+    in seconds. `end` is also called when tokenization fails, with a `count`
+    of -1.
+    """
+
+    def start(self, tokenizer: Crossandra, size: int, /) -> None: ...
+
+    def end(
+        self, tokenizer: Crossandra, size: int, count: int, elapsed: float, /
+    ) -> None: ...
+
+    def token(
+        self,
+        tokenizer: Crossandra,
+        kind: Kind,
+        start: int,
+        length: int,
+        elapsed: float,
+        /,
+    ) -> None: ...
+
+
+# The installed tracer and its sampling interval, read once per call
+HOOK: tuple[Tracer, int] | None = None
+
+
+def set_tracer(tracer: Tracer | None, *, sample_every: int = 0) -> None:
+    """
+    Installs `tracer` for all tokenizers in the process, replacing the
+    previous one (None uninstalls it). With a positive `sample_every`, every
+    `sample_every`-th token of each call is also reported to
+    `Tracer.token` along with the time it took to find it.
+    """
+    global HOOK  # noqa: PLW0603
+    if sample_every < 0:
+        msg = "sample_every must not be negative"
+        raise CrossandraValueError(msg)
+    HOOK = None if tracer is None else (tracer, sample_every)
+
+
+def get_tracer() -> Tracer | None:
+    """Returns the installed tracer, if any."""
+    return None if HOOK is None else HOOK[0]
+
+
+def sample_spans(
+    tokenizer: Crossandra,
+    spans: Iterator[tuple[int, int, Kind]],
+    tracer: Tracer,
+    every: int,
+) -> Iterator[tuple[int, int, Kind]]:
+    """Passes `spans` through, timing and reporting every `every`-th one."""
+    i = 0
+    while True:
+        i += 1
+        if i % every:
+            if (span := next(spans, None)) is None:
+                return
+        else:
+            start = perf_counter()
+            if (span := next(spans, None)) is None:
+                return
+            tracer.token(tokenizer, span[2], span[0], span[1], perf_counter() - start)
+        yield span
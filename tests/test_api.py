@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import pickle
 import re
+import subprocess
+import sys
+import threading
 from enum import Enum
 from typing import TYPE_CHECKING, Any
 
@@ -10,14 +14,20 @@ from crossandra import (
     Crossandra,
     CrossandraTokenizationError,
     CrossandraValueError,
+    InvalidSpan,
+    LazyValue,
     Rule,
     RuleGroup,
+    Token,
     common,
 )
 from crossandra.lib import invert_enum
 from crossandra.rule import IGNORED, NOT_APPLIED
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from crossandra.lib import Kind
     from tests.test_common import RuleResult
 
 
@@ -192,6 +202,36 @@ def test_tokenize_fast_with_positions() -> None:
     ]
 
 
+@pytest.mark.parametrize(
+    "source",
+    ["", "+-[]", " + \n- ", "\x00+\x01-\x02", "ż+ó\ud800-😀", "+ \x01 - x"],
+)
+@pytest.mark.parametrize("exclude", [(), (BrainfuckToken.SUB,)])
+def test_tokenize_fast_tables(source: str, exclude: tuple[Kind, ...]) -> None:
+    t = Crossandra(
+        BrainfuckToken,
+        ignore_whitespace=True,
+        ignored_characters="\x00",
+        suppress_unknown=True,
+    )
+    # Fast Mode output matches the spans found one character at a time
+    tokens: list[Any] = t.tokenize(source, exclude=exclude, output="tokens")
+    expected = [(token.start, token.kind) for token in tokens]
+    assert t.tokenize(source, exclude=exclude, with_positions=True) == expected
+    assert t.tokenize(source, exclude=exclude) == [k for _, k in expected]
+
+
+def test_tokenize_fast_unknown() -> None:
+    t = Crossandra(BrainfuckToken, ignore_whitespace=True)
+    assert t.tokenize(" +\n- ", exclude=[BrainfuckToken.ADD]) == [BrainfuckToken.SUB]
+    with pytest.raises(CrossandraTokenizationError) as e:
+        t.tokenize("+ -\x01+")
+    assert (e.value.token, e.value.offset) == ("\x01", 3)
+    with pytest.raises(CrossandraTokenizationError) as e:
+        Crossandra(ignored_characters="+").tokenize("++ ", with_positions=True)
+    assert (e.value.token, e.value.offset) == (" ", 2)
+
+
 @pytest.mark.parametrize(
     ("expression", "result"),
     [
@@ -283,6 +323,18 @@ def test_rule_group() -> None:
     assert (a, b) == (x, y) == (p, r)
 
 
+def test_rule_group_value_semantics() -> None:
+    a, b = Rule[str]("a"), Rule[str]("b")
+    group = RuleGroup((a, b))
+    assert group == a | b
+    assert group != RuleGroup((b, a))
+    assert hash(group) == hash(a | b)
+    assert group.rules == (a, b)
+    assert repr(group) == f"RuleGroup(rules={(a, b)!r})"
+    with pytest.raises(AttributeError):
+        group.rules = (a,)  # type: ignore[misc]
+
+
 def test_rule_properties() -> None:
     a = Rule[str]("a")
     b = Rule[str]("a")
@@ -383,3 +435,626 @@ def test_tokenize_fast_with_ignored_with_positions() -> None:
         (0, Test.FOO),
         (2, Test.BAR),
     ]
+
+
+def test_tokenize_many() -> None:
+    sources = ["2 * 2", "10 % 3", "", "2**3"]
+    t = Crossandra(ArithmeticToken, rules=[common.INT], ignore_whitespace=True)
+    assert t.tokenize_many(sources) == [t.tokenize(s) for s in sources]
+
+
+def test_tokenize_many_with_positions() -> None:
+    t = Crossandra(BrainfuckToken, suppress_unknown=True)
+    assert t.tokenize_many(["a+b", "-"], with_positions=True, max_workers=2) == [
+        [(1, BrainfuckToken.ADD)],
+        [(0, BrainfuckToken.SUB)],
+    ]
+
+
+def test_tokenize_many_error() -> None:
+    with pytest.raises(CrossandraTokenizationError):
+        Crossandra(rules=[common.WORD]).tokenize_many(["hello", "hi there"])
+
+
+def test_shared_between_threads() -> None:
+    t = Crossandra(
+        ArithmeticToken,
+        rules=[common.FLOAT | common.INT, common.WORD],
+        ignore_whitespace=True,
+    )
+    source = "2 ** x + 3.5 * yz - 10 % 4 / w " * 50
+    expected = t.tokenize(source, with_positions=True)
+    n_threads = 8
+    barrier = threading.Barrier(n_threads)
+    results: list[list[tuple[int, Any]]] = []
+
+    def worker() -> None:
+        barrier.wait()
+        results.extend(t.tokenize(source, with_positions=True) for _ in range(20))
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == n_threads * 20
+    assert all(result == expected for result in results)
+
+
+def test_caches_filled_between_threads() -> None:
+    # A new enum and new rules, so that every cache starts out empty
+    Op = Enum("Op", {"ADD": "+", "SUB": "-"})  # noqa: N806
+    fast = Crossandra(Op, ignore_whitespace=True)
+    rules = Crossandra(
+        Op,
+        rules=[Rule(r"\d+", int), Rule(r"[a-z]+")],
+        ignore_whitespace=True,
+        longest_match=True,
+    )
+    n_threads = 8
+    barrier = threading.Barrier(n_threads)
+    results: list[list[list[Any]]] = []
+
+    def worker() -> None:
+        barrier.wait()
+        results.append(
+            [
+                fast.tokenize("+ - +"),
+                fast.tokenize(b"+ - +"),
+                rules.tokenize("1 + x - 23"),
+                rules.tokenize(b"1 + x - 23", decode=True),
+            ]
+        )
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    add, sub = Op.ADD, Op.SUB
+    expected = [[add, sub, add]] * 2 + [[1, add, "x", sub, 23]] * 2
+    assert results == [expected] * n_threads
+
+
+def test_rule_match() -> None:
+    rule = Rule(r"\d+", int)
+    assert (rule.match("123a"), rule.match("a123")) == (3, NOT_APPLIED)
+
+
+def test_rule_convert() -> None:
+    assert (Rule(r"\d+", int).convert("123"), Rule(r"\d+").convert("123")) == (
+        123,
+        "123",
+    )
+
+
+def test_invalid_output() -> None:
+    with pytest.raises(CrossandraValueError):
+        Crossandra().tokenize("", output="foo")  # type: ignore[arg-type]
+
+
+def test_output_kinds() -> None:
+    t = Crossandra(ArithmeticToken, rules=[common.INT], ignore_whitespace=True)
+    assert t.tokenize("2 ** 10", output="kinds") == [common.INT, AT.POW, common.INT]
+
+
+def test_output_kinds_skips_converter() -> None:
+    def fail(_: str) -> int:
+        raise AssertionError
+
+    rule = Rule(r"\d+", fail)
+    assert Crossandra(rules=[rule]).tokenize("12", output="kinds") == [rule]
+
+
+def test_output_lazy() -> None:
+    calls: list[str] = []
+
+    def convert(string: str) -> int:
+        calls.append(string)
+        return int(string)
+
+    rule = Rule(r"\d+", convert)
+    t = Crossandra(ArithmeticToken, rules=[rule], ignore_whitespace=True)
+    tokens = t.tokenize("2 ** 10", output="lazy", with_positions=True)
+    assert not calls
+
+    (a_pos, a), (op_pos, op), (b_pos, b) = tokens
+    assert (a_pos, op_pos, b_pos) == (0, 2, 5)
+    assert op is AT.POW
+    assert isinstance(b, LazyValue)
+    assert (b.rule, b.start, b.end, b.text) == (rule, 5, 7, "10")
+    assert (b.value, b.value) == (10, 10)
+    assert calls == ["10"]
+    assert isinstance(a, LazyValue)
+    assert (a.value, calls) == (2, ["10", "2"])
+
+
+def test_output_lazy_fast() -> None:
+    assert Crossandra(BrainfuckToken).tokenize("+-", output="lazy") == [
+        BrainfuckToken.ADD,
+        BrainfuckToken.SUB,
+    ]
+
+
+def test_output_tokens() -> None:
+    t = Crossandra(AT, rules=[common.INT], ignore_whitespace=True)
+    tokens = t.tokenize("2 ** 10", output="tokens")
+    assert tokens == [
+        Token(common.INT, 2, 0, 1),
+        Token(AT.POW, AT.POW, 2, 4),
+        Token(common.INT, 10, 5, 7),
+    ]
+    op = tokens[1]
+    assert isinstance(op, Token)
+    assert (op.kind, op.value, op.start, op.end) == (AT.POW, AT.POW, 2, 4)
+    assert t.tokenize(b"2 ** 10", output="tokens", decode=True) == tokens
+
+
+def test_output_tokens_fast() -> None:
+    assert Crossandra(BrainfuckToken, ignored_characters=" ").tokenize(
+        "+ -", output="tokens"
+    ) == [Token(BF.ADD, BF.ADD, 0, 1), Token(BF.SUB, BF.SUB, 2, 3)]
+
+
+def test_output_tokens_filtered() -> None:
+    t = Crossandra(AT, rules=[common.INT], ignore_whitespace=True)
+    assert t.tokenize("2 ** 10", output="tokens", exclude=[common.INT]) == [
+        Token(AT.POW, AT.POW, 2, 4)
+    ]
+
+
+def test_output_tokens_offset() -> None:
+    t = Crossandra(AT, rules=[common.INT], ignore_whitespace=True)
+    tokens = list(t.tokenize_stream(["1 +", " 23"], output="tokens"))
+    assert tokens == [
+        Token(common.INT, 1, 0, 1),
+        Token(AT.ADD, AT.ADD, 2, 3),
+        Token(common.INT, 23, 4, 6),
+    ]
+
+
+def test_token() -> None:
+    token = Token(AT.ADD, AT.ADD, 0, 1)
+    assert (
+        repr(token)
+        == "Token(<ArithmeticToken.ADD: '+'>, <ArithmeticToken.ADD: '+'>, 0, 1)"
+    )
+    assert repr(Token(Rule(r"\d+", int), 12, 3, 5)) == r"Token(Rule('\\d+'), 12, 3, 5)"
+    assert token != Token(AT.ADD, AT.ADD, 1, 2)
+    assert token != (0, AT.ADD)
+    assert hash(token) == hash(Token(AT.ADD, AT.ADD, 0, 1))
+    with pytest.raises(AttributeError):
+        token.start = 1  # type: ignore[misc]
+
+
+COMMENT = Rule[str](r"#[^\n]*")
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "result"),
+    [
+        ({}, [2, AT.POW, "# power", 3, AT.ADD, 1]),
+        ({"exclude": [COMMENT]}, [2, AT.POW, 3, AT.ADD, 1]),
+        ({"exclude": [AT.POW, AT.ADD]}, [2, "# power", 3, 1]),
+        ({"include": [common.INT]}, [2, 3, 1]),
+        ({"include": [common.NUMBER, AT.ADD]}, [2, 3, AT.ADD, 1]),
+        ({"include": [common.INT, AT.ADD], "exclude": [AT.ADD]}, [2, 3, 1]),
+        ({"include": []}, []),
+    ],
+)
+def test_tokenize_filtered(kwargs: dict[str, Any], result: list[Any]) -> None:
+    t = Crossandra(
+        ArithmeticToken,
+        rules=[common.INT, COMMENT],
+        ignore_whitespace=True,
+    )
+    assert t.tokenize("2 ** # power\n3 + 1", **kwargs) == result
+
+
+def test_tokenize_filtered_skips_converter() -> None:
+    def fail(_: str) -> int:
+        raise AssertionError
+
+    rule = Rule(r"\d+", fail)
+    t = Crossandra(rules=[rule, common.WORD], ignore_whitespace=True)
+    assert t.tokenize("a 1 b", exclude=[rule], with_positions=True) == [
+        (0, "a"),
+        (4, "b"),
+    ]
+
+
+BF = BrainfuckToken
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "result"),
+    [
+        ({"exclude": [BF.READ, BF.BEGIN_LOOP]}, [(15, BF.WRITE), (17, BF.END_LOOP)]),
+        ({"include": [BF.READ]}, [(13, BF.READ), (16, BF.READ)]),
+    ],
+)
+def test_tokenize_fast_filtered(
+    kwargs: dict[str, Any], result: list[tuple[int, Any]]
+) -> None:
+    t = Crossandra(BrainfuckToken, suppress_unknown=True)
+    assert t.tokenize("cat program: ,[.,]", with_positions=True, **kwargs) == result
+
+
+def test_count() -> None:
+    t = Crossandra(
+        ArithmeticToken,
+        rules=[common.INT, COMMENT],
+        ignore_whitespace=True,
+    )
+    source = "2 ** # power\n3 + 1 + 4"
+    assert t.count(source) == {common.INT: 4, AT.POW: 1, COMMENT: 1, AT.ADD: 2}
+    assert t.count(source, include=[AT.ADD, COMMENT]) == {COMMENT: 1, AT.ADD: 2}
+
+
+def test_count_fast() -> None:
+    t = Crossandra(BrainfuckToken, ignored_characters=" ")
+    assert t.count("+ + - [ ]", exclude=[BF.END_LOOP]) == {
+        BF.ADD: 2,
+        BF.SUB: 1,
+        BF.BEGIN_LOOP: 1,
+    }
+
+
+def test_count_fast_error() -> None:
+    with pytest.raises(CrossandraTokenizationError, match="'a'"):
+        Crossandra(BrainfuckToken).count("+-ab-a")
+
+
+def test_count_fast_suppress() -> None:
+    t = Crossandra(BrainfuckToken, suppress_unknown=True)
+    assert t.count("+-ab-a") == {BF.ADD: 1, BF.SUB: 2}
+
+
+def test_scan_assemble() -> None:
+    t = Crossandra(
+        ArithmeticToken,
+        rules=[common.INT, COMMENT],
+        ignore_whitespace=True,
+    )
+    source = "2 ** # power\r\n3"
+    spans = list(t.scan(source))
+    assert spans == [
+        (0, 1, common.INT),
+        (2, 2, AT.POW),
+        (5, 7, COMMENT),
+        (13, 1, common.INT),
+    ]
+    assert t.assemble(source, spans, with_positions=True) == t.tokenize(
+        source, with_positions=True
+    )
+
+
+def test_scan_fast() -> None:
+    t = Crossandra(BrainfuckToken, ignored_characters=" ")
+    assert list(t.scan("+ -")) == [(0, 1, BF.ADD), (2, 1, BF.SUB)]
+    with pytest.raises(CrossandraTokenizationError):
+        list(t.scan("+a"))
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_tokenize_bytes(wrap: Callable[[bytes], Any]) -> None:
+    t = Crossandra(
+        ArithmeticToken,
+        rules=[common.INT, common.WORD],
+        ignore_whitespace=True,
+    )
+    tokens = t.tokenize(wrap(b"2 ** x\r\n+ 10"), with_positions=True)
+    assert tokens == [(0, 2), (2, AT.POW), (5, b"x"), (7, AT.ADD), (9, 10)]
+    assert isinstance(tokens[2][1], memoryview)
+
+
+def test_tokenize_bytes_decode() -> None:
+    t = Crossandra(rules=[common.WORD, common.INT], ignore_whitespace=True)
+    assert t.tokenize(b"ab 12 cd", decode=True) == ["ab", 12, "cd"]
+
+
+def test_tokenize_bytes_offsets() -> None:
+    class Arrow(Enum):
+        RIGHT = "→"
+        LEFT = "<-"
+
+    t = Crossandra(Arrow, rules=[common.WORD], ignore_whitespace=True)
+    source = "a → b <- c"
+    assert t.tokenize(source.encode(), output="kinds", with_positions=True) == [
+        (0, common.WORD),
+        (2, Arrow.RIGHT),
+        (6, common.WORD),
+        (8, Arrow.LEFT),
+        (11, common.WORD),
+    ]
+
+
+def test_tokenize_bytes_lazy() -> None:
+    t = Crossandra(rules=[common.WORD, common.INT], ignore_whitespace=True)
+    word, number = t.tokenize(b"ab 12", output="lazy")
+    assert isinstance(word, LazyValue)
+    assert isinstance(number, LazyValue)
+    assert (word.value, number.value) == (b"ab", 12)
+    assert isinstance(word.value, memoryview)
+
+
+def test_tokenize_bytes_fast() -> None:
+    t = Crossandra(BrainfuckToken, suppress_unknown=True)
+    assert t.tokenize(b"cat program: ,[.,]", exclude=[BF.READ]) == [
+        BF.BEGIN_LOOP,
+        BF.WRITE,
+        BF.END_LOOP,
+    ]
+    assert t.count(bytearray(b"++-")) == {BF.ADD: 2, BF.SUB: 1}
+
+
+@pytest.mark.parametrize(
+    ("tokenizer", "source"),
+    [
+        (Crossandra(BrainfuckToken), b"+a-"),
+        (Crossandra(rules=[common.INT]), b"1a2"),
+    ],
+)
+def test_tokenize_bytes_error(tokenizer: Crossandra, source: bytes) -> None:
+    with pytest.raises(CrossandraTokenizationError, match="b'a'"):
+        tokenizer.tokenize(source)
+
+
+def test_tokenize_bytes_non_ascii_ignored() -> None:
+    with pytest.raises(CrossandraValueError):
+        Crossandra(ignored_characters="→").tokenize(b"")
+
+
+def test_rule_match_bytes() -> None:
+    rule = Rule[str](r"\w+", flags=re.IGNORECASE)
+    assert (rule.match_bytes(b"ab1 c"), rule.match_bytes(b" ")) == (3, NOT_APPLIED)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "source", "length"),
+    [
+        ("日本", "日本語 文字", 6),
+        ("(?:日|本)+", "日本語", 6),
+        ("#.*", "#文字", 7),
+        ('"[^"]*"', '"語" ', 5),
+        (r"\S+", "日本語 文字", 9),
+    ],
+)
+def test_rule_match_bytes_non_ascii(pattern: str, source: str, length: int) -> None:
+    assert Rule[str](pattern).match_bytes(source.encode()) == length
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["[一-龥]+", "[日]", "[^日]*", "日+", ".", "[^ ]", r"\S", ".{2}", "(?=.)日"],
+)
+def test_rule_match_bytes_partial_characters(pattern: str) -> None:
+    rule = Rule[str](pattern)
+    with pytest.raises(CrossandraValueError, match=r"single bytes|last byte"):
+        rule.match_bytes("日本語 文字".encode())
+    with pytest.raises(CrossandraValueError):
+        Crossandra(rules=[rule]).tokenize("日本語 文字".encode(), decode=True)
+
+
+def test_tokenize_many_bytes() -> None:
+    t = Crossandra(rules=[common.WORD], ignore_whitespace=True)
+    assert t.tokenize_many([b"ab c", "d"], decode=True) == [["ab", "c"], ["d"]]
+
+
+def test_prefix_token_at_end() -> None:
+    assert Crossandra(ArithmeticToken, rules=[common.INT]).tokenize("2*") == [
+        2,
+        AT.MUL,
+    ]
+
+
+def test_lazy_compile() -> None:
+    rule: Rule[str] = Rule("(")
+    assert rule.pattern == "("
+    with pytest.raises(re.error):
+        Crossandra(rules=[rule])
+    valid: Rule[str] = Rule("a+")
+    assert valid.compile() is valid.compile()
+
+
+def test_lazy_import() -> None:
+    code = (
+        "import sys, crossandra\n"
+        "assert 'crossandra.common' not in sys.modules\n"
+        "assert 'crossandra.cache' not in sys.modules\n"
+        "assert 'crossandra.pipeline' not in sys.modules\n"
+        "assert 'crossandra.stream' not in sys.modules\n"
+        "assert crossandra.common.INT.apply('12') == (12, 2)\n"
+        "assert crossandra.TokenCache.__module__ == 'crossandra.cache'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+
+@pytest.mark.parametrize(
+    ("tokenizer", "source", "token"),
+    [
+        (Crossandra(BrainfuckToken), "+-+a-a", "a"),
+        (Crossandra(BrainfuckToken), b"+-+a-a", b"a"),
+        (Crossandra(rules=[common.INT], ignore_whitespace=True), "1 2a", "a"),
+        (Crossandra(rules=[common.INT], ignore_whitespace=True), b"1 2a", b"a"),
+    ],
+)
+def test_error_offset(tokenizer: Crossandra, source: str | bytes, token: str) -> None:
+    with pytest.raises(CrossandraTokenizationError) as e:
+        tokenizer.tokenize(source)
+    assert (e.value.token, e.value.offset) == (token, 3)
+    assert str(e.value) == f"invalid token: {token!r} (at position 3)"
+
+
+def test_error_offset_count_fast() -> None:
+    with pytest.raises(CrossandraTokenizationError) as e:
+        Crossandra(BrainfuckToken).count("+-ab-a")
+    assert (e.value.token, e.value.offset) == ("a", 2)
+
+
+def test_error_pickle() -> None:
+    error = CrossandraTokenizationError("a", 2)
+    loaded = pickle.loads(pickle.dumps(error))  # noqa: S301
+    assert (loaded.token, loaded.offset, str(loaded)) == ("a", 2, str(error))
+
+
+def test_error_message_only() -> None:
+    error = CrossandraTokenizationError("invalid token: 'a'")
+    assert (str(error), error.offset) == ("invalid token: 'a'", None)
+    loaded = pickle.loads(pickle.dumps(error))  # noqa: S301
+    assert str(loaded) == str(error)
+    assert str(CrossandraTokenizationError()) == ""
+
+
+@pytest.mark.parametrize(
+    ("tokenizer", "source", "tokens", "invalid"),
+    [
+        (
+            Crossandra(BrainfuckToken, ignored_characters=" "),
+            "+ab- $\n.",
+            [BF.ADD, BF.SUB, BF.WRITE],
+            [InvalidSpan(1, 3, "ab"), InvalidSpan(5, 7, "$\n")],
+        ),
+        (
+            Crossandra(BrainfuckToken),
+            b"ab+c",
+            [BF.ADD],
+            [InvalidSpan(0, 2, b"ab"), InvalidSpan(3, 4, b"c")],
+        ),
+        (
+            Crossandra(AT, rules=[common.INT], ignore_whitespace=True),
+            "1 + a$ * 2 ?",
+            [1, AT.ADD, AT.MUL, 2],
+            [InvalidSpan(4, 6, "a$"), InvalidSpan(11, 12, "?")],
+        ),
+        (
+            Crossandra(AT, rules=[common.INT], ignore_whitespace=True),
+            b"1 + a$ * 2 ?",
+            [1, AT.ADD, AT.MUL, 2],
+            [InvalidSpan(4, 6, b"a$"), InvalidSpan(11, 12, b"?")],
+        ),
+        (Crossandra(AT, rules=[common.INT]), "2*3", [2, AT.MUL, 3], []),
+    ],
+)
+def test_tokenize_with_errors(
+    tokenizer: Crossandra,
+    source: str | bytes,
+    tokens: list[Any],
+    invalid: list[InvalidSpan],
+) -> None:
+    assert tokenizer.tokenize_with_errors(source) == (tokens, invalid)
+
+
+def test_tokenize_with_errors_suppress() -> None:
+    t = Crossandra(BrainfuckToken, suppress_unknown=True)
+    assert t.tokenize_with_errors("+a-", with_positions=True) == (
+        [(0, BF.ADD), (2, BF.SUB)],
+        [InvalidSpan(1, 2, "a")],
+    )
+
+
+class Keyword(Enum):
+    IF = "if"
+    IN = "in"
+
+
+@pytest.mark.parametrize(
+    ("source", "result"),
+    [
+        ("if iffy in inn", [Keyword.IF, "iffy", Keyword.IN, "inn"]),
+        ("2.5e3 12 x1 .5", [2500.0, 12, "x1", 0.5]),
+        ("ab ab_1", ["ab", "ab_1"]),
+    ],
+)
+def test_longest_match(source: str, result: list[Any]) -> None:
+    t = Crossandra(
+        Keyword,
+        rules=[common.INT, common.FLOAT, common.WORD, common.C_NAME],
+        ignore_whitespace=True,
+        longest_match=True,
+    )
+    assert t.tokenize(source) == result
+    assert t.tokenize(source.encode(), decode=True) == result
+
+
+def test_longest_match_priority() -> None:
+    # Ties are broken by priority, so WORD wins over C_NAME
+    word, name = common.WORD, common.C_NAME
+    t = Crossandra(rules=[word, name], ignore_whitespace=True, longest_match=True)
+    assert t.tokenize("ab ab1", output="kinds") == [word, name]
+
+
+def test_longest_match_ignored_rule() -> None:
+    comment: Rule[str] = Rule(r"--.*", ignore=True)
+    t = Crossandra(
+        AT, rules=[comment, common.INT], ignore_whitespace=True, longest_match=True
+    )
+    assert t.tokenize("1 - 2 -- 3") == [1, AT.SUB, 2]
+    assert t.tokenize_with_errors("1 ? 2") == ([1, 2], [InvalidSpan(2, 3, "?")])
+
+
+def test_longest_match_unknown_first_chars() -> None:
+    t = Crossandra(
+        rules=[common.INT, Rule(r"(?i:x)[0-9]+")],
+        longest_match=True,
+    )
+    assert t.tokenize("12X3") == [12, "X3"]
+    assert t.tokenize(b"12X3", decode=True) == [12, "X3"]
+
+
+def test_longest_match_bytes_negated_category() -> None:
+    t = Crossandra(rules=[Rule(r"\S+")], longest_match=True, ignore_whitespace=True)
+    assert t.tokenize("é x".encode(), decode=True) == t.tokenize("é x") == ["é", "x"]
+
+
+class Sql(Enum):
+    SELECT = "select"
+    SELECT_ALL = "select*"
+    STAR = "*"
+    STREET = "Straße"
+    KELVIN = "k"
+
+
+class Letter(Enum):
+    A = "a"
+    B = "B"
+
+
+@pytest.mark.parametrize("bytes_input", [False, True])
+def test_case_insensitive(bytes_input: bool) -> None:
+    t = Crossandra(
+        Sql, rules=[common.C_NAME], ignore_whitespace=True, case_insensitive=True
+    )
+    source = "SELECT * SeLeCt* straSSE STRAẞE K \u212a"
+    result = [
+        Sql.SELECT,
+        Sql.STAR,
+        Sql.SELECT_ALL,
+        "straSSE",
+        Sql.STREET,
+        Sql.KELVIN,
+        Sql.KELVIN,
+    ]
+    if bytes_input:
+        assert t.tokenize(source.encode(), decode=True) == result
+    else:
+        assert t.tokenize(source) == result
+
+
+def test_case_insensitive_fast() -> None:
+    t = Crossandra(BrainfuckToken, case_insensitive=True)
+    assert t.tokenize("+-") == [BF.ADD, BF.SUB]
+    t = Crossandra(Letter, case_insensitive=True)
+    assert t.tokenize("aAbB") == [Letter.A, Letter.A, Letter.B, Letter.B]
+    assert t.tokenize(b"AabB") == [Letter.A, Letter.A, Letter.B, Letter.B]
+
+
+def test_case_insensitive_ambiguous() -> None:
+    class Ambiguous(Enum):
+        LOWER = "a"
+        UPPER = "A"
+
+    with pytest.raises(CrossandraValueError, match="ambiguous"):
+        Crossandra(Ambiguous, case_insensitive=True)
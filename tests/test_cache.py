@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import os
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from crossandra import Crossandra, CrossandraTokenizationError, Rule, TokenCache, common
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class Op(Enum):
+    ADD = "+"
+    POW = "**"
+
+
+SOURCE = "2 ** 10 + x\r\n+ 3"
+
+
+def tokenizer(*, suppress_unknown: bool = False) -> Crossandra:
+    return Crossandra(
+        Op,
+        rules=[common.INT, Rule(r"\s+", ignore=True)],
+        suppress_unknown=suppress_unknown,
+    )
+
+
+def cached_files(path: Path) -> list[Path]:
+    return sorted(path.glob("*.tok"))
+
+
+def test_cache_hit(tmp_path: Path) -> None:
+    t = tokenizer(suppress_unknown=True)
+    cache = TokenCache(t, tmp_path)
+    expected = t.tokenize(SOURCE, with_positions=True)
+    assert cache.tokenize(SOURCE, with_positions=True) == expected
+    assert len(cached_files(tmp_path)) == 1
+    assert cache.tokenize(SOURCE, with_positions=True) == expected
+    assert TokenCache(t, tmp_path).tokenize(SOURCE) == t.tokenize(SOURCE)
+    assert len(cached_files(tmp_path)) == 1
+
+
+def test_cache_applies_converters_on_load(tmp_path: Path) -> None:
+    calls: list[str] = []
+
+    def convert(string: str) -> int:
+        calls.append(string)
+        return int(string)
+
+    t = Crossandra(Op, rules=[Rule(r"\d+", convert)], ignore_whitespace=True)
+    TokenCache(t, tmp_path).tokenize("1 + 2")
+    calls.clear()
+    assert TokenCache(t, tmp_path).tokenize("1 + 2") == [1, Op.ADD, 2]
+    assert calls == ["1", "2"]
+    assert TokenCache(t, tmp_path).tokenize("1 + 2", output="kinds") == [
+        t.kinds[-1],
+        Op.ADD,
+        t.kinds[-1],
+    ]
+
+
+def test_cache_empty_result(tmp_path: Path) -> None:
+    cache = TokenCache(tokenizer(), tmp_path)
+    assert cache.tokenize("") == []
+    assert cache.tokenize("") == []
+
+
+def test_cache_keyed_by_tokenizer(tmp_path: Path) -> None:
+    tokenizers = [tokenizer(), tokenizer(suppress_unknown=True), tokenizer()]
+    for t in tokenizers:
+        TokenCache(t, tmp_path).tokenize("1 + 2")
+    assert {f.name.partition("-")[0] for f in cached_files(tmp_path)} == {
+        t.fingerprint[:32] for t in tokenizers
+    }
+    assert len(cached_files(tmp_path)) == len(tokenizers) - 1
+
+
+def test_cache_errors_not_cached(tmp_path: Path) -> None:
+    cache = TokenCache(tokenizer(), tmp_path)
+    with pytest.raises(CrossandraTokenizationError):
+        cache.tokenize(SOURCE)
+    assert not cached_files(tmp_path)
+
+
+def test_cache_fast(tmp_path: Path) -> None:
+    class BF(Enum):
+        ADD = "+"
+        SUB = "-"
+
+    t = Crossandra(BF, suppress_unknown=True)
+    cache = TokenCache(t, tmp_path)
+    for _ in range(2):
+        assert cache.tokenize("+a-", with_positions=True) == [(0, BF.ADD), (2, BF.SUB)]
+
+
+def test_cache_eviction(tmp_path: Path) -> None:
+    # every "1 " token takes up 12 bytes
+    cache = TokenCache(tokenizer(), tmp_path, max_size=12 * 25)
+    for n in range(1, 11):
+        cache.tokenize("1 " * n)
+    assert sum(f.stat().st_size for f in cached_files(tmp_path)) <= 12 * 25
+    cache.clear()
+    assert not cached_files(tmp_path)
+
+
+def test_cache_eviction_scans(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    scans = 0
+    scandir = os.scandir
+
+    def counting_scandir(path: Path) -> Iterator[os.DirEntry[str]]:
+        nonlocal scans
+        scans += 1
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    cache = TokenCache(tokenizer(), tmp_path, max_size=12 * 100)
+    for n in range(200):
+        cache.tokenize(f"{n} ")
+    # The directory is only scanned on the first store and whenever another
+    # 1/4 of max_size has been stored since the last eviction
+    assert scans <= 1 + 200 // 25
+    assert sum(f.stat().st_size for f in cached_files(tmp_path)) <= 12 * 100
+
+
+def test_cache_entry_in_use(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # On Windows, entries open in another process can't be replaced or removed
+    replace, unlink = Path.replace, Path.unlink
+
+    def replace_in_use(_: Path, target: Path) -> Path:
+        raise PermissionError(target)
+
+    def unlink_in_use(self: Path, *, missing_ok: bool = False) -> None:
+        if self.suffix == ".tok":
+            raise PermissionError(self)
+        unlink(self, missing_ok=missing_ok)
+
+    cache = TokenCache(tokenizer(), tmp_path, max_size=12 * 10)
+    cache.tokenize("1 " * 10)
+    monkeypatch.setattr(Path, "replace", replace_in_use)
+    monkeypatch.setattr(Path, "unlink", unlink_in_use)
+    assert cache.tokenize("2 " * 10) == [2] * 10
+    assert [f.suffix for f in tmp_path.iterdir()] == [".tok"]
+    monkeypatch.setattr(Path, "replace", replace)
+    # Over max_size, but the old entry can't be evicted
+    assert cache.tokenize("3 " * 10) == [3] * 10
+    in_use = cached_files(tmp_path)
+    assert len(in_use) == len(["1", "3"])
+    cache.clear()
+    assert cached_files(tmp_path) == in_use
+    monkeypatch.setattr(Path, "unlink", unlink)
+    assert cache.tokenize("4") == [4]
+    assert len(cached_files(tmp_path)) == 1
+
+
+def test_fingerprint() -> None:
+    assert tokenizer().fingerprint == tokenizer().fingerprint
+    assert tokenizer().fingerprint != tokenizer(suppress_unknown=True).fingerprint
+    assert (
+        Crossandra(rules=[Rule(r"\d", int)]).fingerprint
+        == Crossandra(rules=[Rule(r"\d", float)]).fingerprint
+    )
+    assert Crossandra(Op).fingerprint != Crossandra().fingerprint
+
+
+def test_cache_enum_reordered(tmp_path: Path) -> None:
+    before = Enum("T", {"A": "a", "B": "b"})  # type: ignore[misc]
+    after = Enum("T", {"B": "b", "A": "a"})  # type: ignore[misc]
+    assert Crossandra(before).fingerprint != Crossandra(after).fingerprint
+    assert TokenCache(Crossandra(before), tmp_path).tokenize("ab") == [
+        before.A,
+        before.B,
+    ]
+    assert TokenCache(Crossandra(after), tmp_path).tokenize("ab") == [
+        after.A,
+        after.B,
+    ]
+
+
+def test_kinds() -> None:
+    assert tokenizer().kinds == (Op.ADD, Op.POW, common.INT, Rule(r"\s+", ignore=True))
+
+
+def test_cache_bytes(tmp_path: Path) -> None:
+    t = Crossandra(rules=[common.WORD], ignore_whitespace=True, suppress_unknown=True)
+    cache = TokenCache(t, tmp_path)
+    for _ in range(2):
+        assert cache.tokenize("é ab", with_positions=True) == [(2, "ab")]
+        assert cache.tokenize("é ab".encode(), decode=True, with_positions=True) == [
+            (3, "ab")
+        ]
+    assert len(cached_files(tmp_path)) == len(["str", "bytes"])
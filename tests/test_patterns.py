@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import sys
+from enum import Enum
+
+import pytest
+
+from crossandra import Crossandra, CrossandraValueError, Rule, common
+from crossandra.patterns import can_start, can_start_bytes, first_chars
+
+
+@pytest.mark.parametrize(
+    ("pattern", "chars", "categories"),
+    [
+        ("abc", "a", ()),
+        ("a*b?c", "abc", ()),
+        ("(?:ab)+|[x-z]", "axyz", ()),
+        (r"(?=q)\bq", "q", ()),
+        (r"[_\d]", "_", ("CATEGORY_DIGIT",)),
+        (r"\s*\w", "", ("CATEGORY_SPACE", "CATEGORY_WORD")),
+        (common.SIGNED_INT.pattern, "+-", ()),
+    ],
+)
+def test_first_chars(pattern: str, chars: str, categories: tuple[str, ...]) -> None:
+    assert first_chars(pattern) == (frozenset(chars), frozenset(categories))
+
+
+@pytest.mark.parametrize("pattern", [".", "[^a]", "(?i)a", "(?i:a)", "x|.", "["])
+def test_first_chars_unknown(pattern: str) -> None:
+    assert first_chars(pattern) is None
+
+
+def test_can_start() -> None:
+    first = first_chars(r"x|\d")
+    assert can_start(first, "x")
+    assert can_start(first, "٣")  # ARABIC-INDIC DIGIT THREE
+    assert not can_start(first, "y")
+    assert can_start(None, "y")
+
+
+def test_can_start_bytes() -> None:
+    first = first_chars(r"é|\w")
+    assert can_start_bytes(first, ord("a"))
+    assert can_start_bytes(first, "é".encode()[0])
+    assert not can_start_bytes(first, "ą".encode()[0] + 1)
+    assert not can_start_bytes(first, ord("-"))
+    # Negated categories match any non-ASCII byte
+    assert can_start_bytes(first_chars(r"\S+"), "é".encode()[0])
+    assert not can_start_bytes(first_chars(r"\S+"), ord(" "))
+
+
+@pytest.mark.parametrize(
+    ("pattern", "kinds"),
+    [
+        (r"(a+)+$", ["nested-quantifier"]),
+        (r"(\w+\s?)+", ["nested-quantifier"]),
+        (r"([^,]+,?)+", ["nested-quantifier"]),
+        (r"(a|b\w*)+", ["nested-quantifier"]),
+        (r"(a|aa)+$", ["overlapping-alternation"]),
+        (r"(a|a)+", ["overlapping-alternation"]),
+        (r"(?:\w|\d\d)+", ["overlapping-alternation"]),
+        (r"[a-z]*", ["empty-match"]),
+        (r"(?:a*)*", ["nested-quantifier", "empty-match"]),
+        (r"(a+b)+", []),
+        (r"(?:\d+\.)*\d+", []),
+        (r"(ab|ac|b)+", []),
+        (r"(?:a++)+", []),
+    ],
+)
+def test_analyze(pattern: str, kinds: list[str]) -> None:
+    if "++" in pattern and sys.version_info < (3, 11):
+        pytest.skip("possessive quantifiers need Python 3.11")
+    assert [i.kind for i in Rule(pattern).analyze()] == kinds
+
+
+def test_analyze_common() -> None:
+    rules = [r for r in vars(common).values() if isinstance(r, Rule)]
+    assert [i for r in rules for i in r.analyze(fuzz=0.01)] == []
+
+
+def test_analyze_fuzz() -> None:
+    rule = Rule[str](r"(a|a)*$")
+    issues = rule.analyze(fuzz=1)
+    assert issues[-1].kind == "slow"
+    assert issues[-1].rule is rule
+
+
+def test_analyze_strict() -> None:
+    Rule(r"a+").analyze(strict=True)
+    with pytest.raises(CrossandraValueError, match="empty string"):
+        Rule(r"a*").analyze(strict=True)
+
+
+class Op(Enum):
+    ADD = "+"
+    SUB = "-"
+
+
+def test_analyze_shadowed() -> None:
+    signed = Rule[str](r"[+-]\d+")
+    lower = Rule[str](r"[a-z]+")
+    duplicate = Rule[str](common.C_NAME.pattern)
+    spaces = Rule[str](r" +")
+    t = Crossandra(
+        Op,
+        rules=[common.C_NAME, signed, lower, duplicate, spaces, common.INT],
+        ignore_whitespace=True,
+    )
+    issues = t.analyze()
+    assert [(i.rule, i.kind) for i in issues] == [
+        (signed, "shadowed"),
+        (lower, "shadowed"),
+        (duplicate, "shadowed"),
+        (spaces, "shadowed"),
+    ]
+    assert "<Op.ADD: '+'>, <Op.SUB: '-'>" in issues[0].message
+    assert "the earlier rule" in issues[1].message
+    assert "ignored characters" in issues[3].message
+    with pytest.raises(CrossandraValueError):
+        t.analyze(strict=True)
+
+
+def test_analyze_shadowed_longest_match() -> None:
+    # With longest_match, longer matches win over enum tokens
+    signed = Rule[str](r"[+-]\d+")
+    assert Crossandra(Op, rules=[signed], longest_match=True).analyze() == []
+
+
+def test_analyze_shadowed_assertions() -> None:
+    # "a" followed by a digit doesn't match the first rule
+    t = Crossandra(rules=[Rule(r"a(?!\d)"), Rule(r"a\d")])
+    assert t.analyze() == []
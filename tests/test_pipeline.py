@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from crossandra import (
+    Crossandra,
+    CrossandraIndentationError,
+    CrossandraTokenizationError,
+    Filter,
+    Indent,
+    Map,
+    Pipeline,
+    Rule,
+    Token,
+    common,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class Py(Enum):
+    COLON = ":"
+    ASSIGN = "="
+    NEWLINE = "\n"
+    INDENT = "<indent>"
+    DEDENT = "<dedent>"
+
+
+COMMENT = Rule[str](r"#[^\n]*")
+TOKENIZER = Crossandra(
+    Py, rules=[COMMENT, common.INT, common.C_NAME], ignored_characters=" \t"
+)
+INDENT = Indent(Py.NEWLINE, Py.INDENT, Py.DEDENT)
+SOURCE = """\
+if a:
+    b = 1  # one
+    if c:
+        d = 2
+
+    e = 3
+f = 4
+"""
+
+
+def kinds(tokens: list[Any]) -> list[Any]:
+    return [t.value if t.kind is common.C_NAME else t.kind for t in tokens]
+
+
+def test_indent() -> None:
+    tokens = Pipeline(TOKENIZER, [INDENT]).tokenize("a:\n  b\n    c\nd")
+    assert kinds(tokens) == [
+        "a", Py.COLON, Py.NEWLINE,
+        Py.INDENT, "b", Py.NEWLINE,
+        Py.INDENT, "c", Py.NEWLINE,
+        Py.DEDENT, Py.DEDENT, "d",
+    ]  # fmt: skip
+    assert tokens[3] == Token(Py.INDENT, Py.INDENT, 5, 5)
+    assert tokens[9] == Token(Py.DEDENT, Py.DEDENT, 13, 13)
+
+
+def test_indent_closed_at_end() -> None:
+    tokens = Pipeline(TOKENIZER, [INDENT]).tokenize("a:\n  b\n    c\n\n")
+    assert tokens[-2:] == [
+        Token(Py.DEDENT, Py.DEDENT, 14, 14),
+        Token(Py.DEDENT, Py.DEDENT, 14, 14),
+    ]
+
+
+def test_indent_error() -> None:
+    with pytest.raises(CrossandraIndentationError) as e:
+        Pipeline(TOKENIZER, [INDENT]).tokenize("a\n    b\n  c")
+    assert e.value.offset == len("a\n    b\n  ")
+
+
+def test_stages() -> None:
+    symbols: dict[str, int] = {}
+
+    def intern(token: Token) -> Any:
+        if token.kind is common.C_NAME:
+            return symbols.setdefault(token.value, len(symbols))
+        return token.kind
+
+    pipeline = Pipeline(
+        TOKENIZER, [Filter(lambda t: t.kind is not COMMENT), INDENT, Map(intern)]
+    )
+    result = pipeline.tokenize(SOURCE)
+    assert result[:12] == [
+        0, 1, Py.COLON, Py.NEWLINE,
+        Py.INDENT, 2, Py.ASSIGN, common.INT, Py.NEWLINE,
+        0, 3, Py.COLON,
+    ]  # fmt: skip
+    assert symbols == {"if": 0, "a": 1, "b": 2, "c": 3, "d": 4, "e": 5, "f": 6}
+    assert result.count(Py.INDENT) == result.count(Py.DEDENT) == 2  # noqa: PLR2004
+
+
+def test_generator_stage() -> None:
+    def merge_names(tokens: Iterator[Token]) -> Iterator[Token]:
+        prev = None
+        for token in tokens:
+            if prev is not None and token.kind is prev.kind is common.C_NAME:
+                prev = Token(prev.kind, prev.value + token.value, prev.start, token.end)
+                continue
+            if prev is not None:
+                yield prev
+            prev = token
+        if prev is not None:
+            yield prev
+
+    tokens = Pipeline(TOKENIZER, [merge_names]).tokenize("a b c = 1")
+    assert tokens[0] == Token(common.C_NAME, "abc", 0, 5)
+    assert [t.kind for t in tokens[1:]] == [Py.ASSIGN, common.INT]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 100])
+def test_tokenize_stream(size: int) -> None:
+    pipeline = Pipeline(TOKENIZER, [INDENT])
+    chunks = [SOURCE[i : i + size] for i in range(0, len(SOURCE), size)]
+    assert list(pipeline.tokenize_stream(chunks)) == pipeline.tokenize(SOURCE)
+
+
+def test_bytes() -> None:
+    pipeline = Pipeline(TOKENIZER, [INDENT])
+    assert pipeline.tokenize(SOURCE.encode(), decode=True) == pipeline.tokenize(SOURCE)
+
+
+def test_lazy() -> None:
+    seen: list[Token] = []
+    tokens = Pipeline(TOKENIZER, [Map(seen.append)]).apply(
+        TOKENIZER.iter_tokens("a b ?")
+    )
+    next(tokens)
+    assert len(seen) == 1
+    next(tokens)
+    with pytest.raises(CrossandraTokenizationError):
+        next(tokens)
+
+
+def test_iter_tokens() -> None:
+    assert list(TOKENIZER.iter_tokens(SOURCE)) == TOKENIZER.tokenize(
+        SOURCE, output="tokens"
+    )
+    fast = Crossandra(Py, ignored_characters=" ")
+    assert list(fast.iter_tokens(": =")) == [
+        Token(Py.COLON, Py.COLON, 0, 1),
+        Token(Py.ASSIGN, Py.ASSIGN, 2, 3),
+    ]
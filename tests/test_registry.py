@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import gc
+from enum import Enum
+from typing import Any
+
+import pytest
+
+from crossandra import (
+    Crossandra,
+    CrossandraTokenizationError,
+    CrossandraValueError,
+    Rule,
+    RuleGroup,
+    common,
+)
+from crossandra.registry import ENUM_CORES, RULE_DISPATCHES
+
+
+class Keyword(Enum):
+    IF = "if"
+    ELSE = "else"
+    ARROW = "->"
+
+
+class Sign(Enum):
+    PLUS = "+"
+    MINUS = "-"
+
+
+def test_enum_core_shared() -> None:
+    before = len(ENUM_CORES)
+    a = Crossandra(Keyword, rules=[common.C_NAME], ignore_whitespace=True)
+    b = Crossandra(Keyword, rules=[common.INT], ignored_characters="_")
+    assert len(ENUM_CORES) == before + 1
+    assert a.tokenize("if x") == [Keyword.IF, "x"]
+    assert b.tokenize("else_->1") == [Keyword.ELSE, Keyword.ARROW, 1]
+    # The enum's bytes tables are built once for both tokenizers, but
+    # ignored characters stay per tokenizer
+    assert a.tokenize(b"if x_") == [Keyword.IF, b"x_"]
+    core = ENUM_CORES[Keyword, False, True]
+    tables = core.bytes_tables
+    assert tables is not None
+    assert b.tokenize(b"if_1") == [Keyword.IF, 1]
+    with pytest.raises(CrossandraTokenizationError):
+        b.tokenize(b"if 1")
+    assert core.bytes_tables is tables
+
+
+def test_bytes_ignored_per_tokenizer() -> None:
+    Letters = Enum("Letters", {"A": "a", "B": "b"})  # noqa: N806
+    # Kept alive together, so that they share the enum's core
+    spaces = Crossandra(Letters, ignore_whitespace=True)
+    plain = Crossandra(Letters)
+    xs = Crossandra(Letters, ignored_characters="x")
+    non_ascii = Crossandra(Letters, ignored_characters="ż")
+    assert spaces.tokenize(b"a b") == [Letters.A, Letters.B]
+    with pytest.raises(CrossandraTokenizationError):
+        plain.tokenize(b"a b")
+    assert xs.tokenize(b"axb") == [Letters.A, Letters.B]
+    with pytest.raises(CrossandraValueError, match="ASCII"):
+        non_ascii.tokenize(b"ab")
+
+
+def test_enum_core_options() -> None:
+    fast = Crossandra(Sign)
+    slow = Crossandra(Sign, rules=[common.INT])
+    insensitive = Crossandra(Keyword, case_insensitive=True)
+    sensitive = Crossandra(Keyword, rules=[common.C_NAME])
+    for key in (
+        (Sign, False, False),
+        (Sign, False, True),
+        (Keyword, True, False),
+        (Keyword, False, True),
+    ):
+        assert key in ENUM_CORES
+    assert fast.tokenize("+-") == [Sign.PLUS, Sign.MINUS]
+    assert slow.tokenize("+1") == [Sign.PLUS, 1]
+    assert insensitive.tokenize("IfElse") == [Keyword.IF, Keyword.ELSE]
+    assert sensitive.tokenize("If") == ["If"]
+
+
+def test_enum_core_released() -> None:
+    Dynamic = Enum("Dynamic", {"A": "a", "B": "bb"})  # noqa: N806
+    tokenizer = Crossandra(Dynamic)
+    assert (Dynamic, False, False) in ENUM_CORES
+    del tokenizer
+    gc.collect()
+    assert (Dynamic, False, False) not in ENUM_CORES
+
+
+def test_enum_core_error() -> None:
+    Ambiguous = Enum("Ambiguous", {"A": "ab", "B": "AB"})  # noqa: N806
+    with pytest.raises(CrossandraValueError):
+        Crossandra(Ambiguous, case_insensitive=True)
+    assert (Ambiguous, True, False) not in ENUM_CORES
+    assert Crossandra(Ambiguous).tokenize("abAB") == [Ambiguous.A, Ambiguous.B]
+
+
+def test_rule_dispatch_shared() -> None:
+    before = len(RULE_DISPATCHES)
+    rules: list[Rule[Any] | RuleGroup] = [common.INT, common.C_NAME]
+    a = Crossandra(Keyword, rules=rules, longest_match=True)
+    b = Crossandra(Sign, rules=rules, longest_match=True, ignore_whitespace=True)
+    assert len(RULE_DISPATCHES) == before + 1
+    assert a.tokenize("ifx") == ["ifx"]
+    assert b.tokenize("1 + x") == [1, Sign.PLUS, "x"]
+
+
+def test_rule_dispatch_by_identity() -> None:
+    # Equal rules are still different kinds, so they aren't shared
+    first: Rule[str] = Rule(r"\d+")
+    second: Rule[str] = Rule(r"\d+")
+    a = Crossandra(rules=[first], longest_match=True)
+    b = Crossandra(rules=[second], longest_match=True)
+    assert a.tokenize("12", output="kinds") == [first]
+    assert b.tokenize("12", output="kinds") == [second]
+    assert b.tokenize("12", output="kinds")[0] is second
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import tracemalloc
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from crossandra import (
+    ArraySink,
+    CallbackSink,
+    Crossandra,
+    CrossandraValueError,
+    FileSink,
+    TokenFile,
+    common,
+)
+
+if TYPE_CHECKING:
+    from array import array
+    from pathlib import Path
+
+
+class Op(Enum):
+    ADD = "+"
+    POW = "**"
+
+
+TOKENIZER = Crossandra(Op, rules=[common.INT, common.C_NAME], ignore_whitespace=True)
+SOURCE = "2 ** x + 10\nab + 1"
+
+
+def write(path: Path, source: Any, tokenizer: Crossandra = TOKENIZER) -> int:
+    with path.open("wb") as f:
+        return tokenizer.tokenize_into(source, FileSink(f, tokenizer), batch_size=2)
+
+
+@pytest.mark.parametrize("source", [SOURCE, SOURCE.encode()])
+def test_file_sink(tmp_path: Path, source: str | bytes) -> None:
+    path = tmp_path / "tokens"
+    spans = list(TOKENIZER.scan(source))
+    assert write(path, source) == len(spans)
+    with TokenFile(path, TOKENIZER) as tokens:
+        assert len(tokens) == len(spans)
+        assert list(tokens) == spans
+        assert (tokens[0], tokens[-1]) == (spans[0], spans[-1])
+        assert TOKENIZER.assemble(source, tokens, decode=True) == TOKENIZER.tokenize(
+            source, decode=True
+        )
+        with pytest.raises(IndexError):
+            tokens[len(spans)]
+
+
+def test_file_sink_empty(tmp_path: Path) -> None:
+    path = tmp_path / "tokens"
+    assert write(path, "") == 0
+    with TokenFile(path, TOKENIZER) as tokens:
+        assert (len(tokens), list(tokens)) == (0, [])
+
+
+def test_token_file_invalid(tmp_path: Path) -> None:
+    path = tmp_path / "tokens"
+    path.write_bytes(b"not tokens")
+    with pytest.raises(CrossandraValueError, match="not a token file"):
+        TokenFile(path, TOKENIZER)
+    write(path, SOURCE)
+    with pytest.raises(CrossandraValueError, match="differently configured"):
+        TokenFile(path, Crossandra(Op, rules=[common.INT]))
+    # Kinds are stored by index, so reordering the enum's members changes them
+    before = Enum("T", {"A": "a", "B": "b"})  # type: ignore[misc]
+    after = Enum("T", {"B": "b", "A": "a"})  # type: ignore[misc]
+    write(path, "ab", Crossandra(before))
+    with pytest.raises(CrossandraValueError, match="differently configured"):
+        TokenFile(path, Crossandra(after))
+
+
+def test_array_sink() -> None:
+    chunks: list[array[int]] = []
+    sink = ArraySink(TOKENIZER, chunks.append, chunk_size=3)
+    assert TOKENIZER.tokenize_into(SOURCE, sink) == len(list(TOKENIZER.scan(SOURCE)))
+    assert [len(c) // 3 for c in chunks] == [3, 3, 2]
+    kinds = TOKENIZER.kinds
+    assert [
+        (c[i + 1], c[i + 2], kinds[c[i]]) for c in chunks for i in range(0, len(c), 3)
+    ] == list(TOKENIZER.scan(SOURCE))
+
+
+def test_callback_sink() -> None:
+    seen: list[tuple[int, int, Any]] = []
+    sink = CallbackSink(lambda *span: seen.append(span))
+    TOKENIZER.tokenize_into(SOURCE, sink, exclude=[common.INT])
+    assert seen == list(
+        TOKENIZER.scan(SOURCE.replace("2", " ").replace("10", "  ").replace("1", " "))
+    )
+
+
+def test_fast() -> None:
+    t = Crossandra(Op)
+    seen: list[tuple[int, int, Any]] = []
+    t.tokenize_into("++", CallbackSink(lambda *span: seen.append(span)))
+    assert seen == [(0, 1, Op.ADD), (1, 1, Op.ADD)]
+
+
+def peak_memory(source: bytes) -> int:
+    tracemalloc.start()
+    TOKENIZER.tokenize_into(source, CallbackSink(lambda *_: None))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def test_constant_memory() -> None:
+    # Both inputs span multiple batches, which bound the memory used
+    small, large = SOURCE.encode() * 1_000, SOURCE.encode() * 20_000
+    assert peak_memory(large) < peak_memory(small) * 1.5
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import asyncio
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+import pytest
+
+from crossandra import (
+    Crossandra,
+    CrossandraTokenizationError,
+    CrossandraValueError,
+    FollowState,
+    StreamState,
+    common,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class Op(Enum):
+    MUL = "*"
+    POW = "**"
+    ASSIGN = "="
+    EQ = "=="
+
+
+SOURCE = 'x_1 = 2.5e3 ** y\r\nname == "a b" * 10'
+TOKENIZER = Crossandra(
+    Op, rules=[common.NUMBER, common.C_NAME, common.STRING], ignore_whitespace=True
+)
+
+
+def chunked(source: Any, size: int) -> list[Any]:
+    return [source[i : i + size] for i in range(0, len(source), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 100])
+def test_tokenize_stream(size: int) -> None:
+    assert list(
+        TOKENIZER.tokenize_stream(chunked(SOURCE, size), with_positions=True)
+    ) == TOKENIZER.tokenize(SOURCE, with_positions=True)
+
+
+@pytest.mark.parametrize("split", range(len(SOURCE) + 1))
+def test_tokenize_stream_split(split: int) -> None:
+    chunks = [SOURCE[:split], SOURCE[split:]]
+    assert list(TOKENIZER.tokenize_stream(chunks)) == TOKENIZER.tokenize(SOURCE)
+
+
+@pytest.mark.parametrize("size", [1, 4, 100])
+def test_tokenize_stream_bytes(size: int) -> None:
+    source = SOURCE.encode()
+    assert list(
+        TOKENIZER.tokenize_stream(
+            chunked(source, size), decode=True, with_positions=True
+        )
+    ) == TOKENIZER.tokenize(source, decode=True, with_positions=True)
+
+
+def test_tokenize_stream_empty() -> None:
+    assert list(TOKENIZER.tokenize_stream([])) == []
+    assert list(TOKENIZER.tokenize_stream(["", ""])) == []
+
+
+def test_tokenize_stream_crlf() -> None:
+    t = Crossandra(rules=[common.NEWLINE, common.WORD])
+    assert list(t.tokenize_stream(["a\r", "\nb\r", "\r", "\nc"])) == [
+        *t.tokenize("a\r\nb\r\r\nc")
+    ]
+
+
+def test_tokenize_stream_unknown() -> None:
+    chunks = ["x = 1 $", " y"]
+    with pytest.raises(CrossandraTokenizationError):
+        list(TOKENIZER.tokenize_stream(chunks))
+    t = Crossandra(Op, rules=[common.INT], suppress_unknown=True)
+    assert list(t.tokenize_stream(["1$", "2$", "*"])) == [1, 2, Op.MUL]
+
+
+def test_tokenize_stream_fast() -> None:
+    t = Crossandra(Op, rules=[], suppress_unknown=True)
+    assert list(t.tokenize_stream(["*", "*=", "=x*"])) == t.tokenize("**==x*")
+
+
+def test_feed() -> None:
+    tokens, state = TOKENIZER.feed("x = 12", with_positions=True)
+    assert tokens == []
+    assert state == StreamState(0, "x = 12")
+    tokens, state = TOKENIZER.feed("3\ny ", state, with_positions=True)
+    assert tokens == [(0, "x"), (2, Op.ASSIGN), (4, 123)]
+    assert state == StreamState(7, "\ny ")
+    tokens, state = TOKENIZER.feed("*", state, final=True, with_positions=True)
+    assert tokens == [(8, "y"), (10, Op.MUL)]
+    assert state == StreamState(11, "")
+
+
+def test_feed_unknown() -> None:
+    t = Crossandra(rules=[common.WORD, common.STRING], ignore_whitespace=True)
+    tokens, state = t.feed('ab "cd ef')
+    assert tokens == ["ab"]
+    assert state == StreamState(3, '"cd ef')
+    tokens, state = t.feed('"', state, final=True)
+    assert tokens == ['"cd ef"']
+
+
+@pytest.mark.parametrize("kind", [str, str.encode])
+def test_feed_unknown_before_newline(kind: Callable[[str], Any]) -> None:
+    t = Crossandra(rules=[common.WORD], ignore_whitespace=True, suppress_unknown=True)
+    tokens, state = t.feed(kind("ab ! cd\n"), decode=True)
+    assert tokens == ["ab", "cd"]
+    for _ in range(3):
+        tokens, state = t.feed(kind("ef gh\n"), state, decode=True)
+        assert tokens == ["ef", "gh"]
+        assert state.carry == kind("\n")
+    with pytest.raises(CrossandraTokenizationError) as e:
+        Crossandra(rules=[common.WORD], ignore_whitespace=True).feed(kind("ab ! cd\n"))
+    assert e.value.offset == len("ab ")
+
+
+def test_feed_max_buffer() -> None:
+    tokens, state = TOKENIZER.feed("ab cd ", max_buffer=5)
+    assert tokens == ["ab"]
+    assert state == StreamState(3, "cd ")
+    tokens, state = TOKENIZER.feed('"ab', max_buffer=3)
+    assert tokens == []
+    with pytest.raises(CrossandraTokenizationError):
+        TOKENIZER.feed("c", state, max_buffer=3)
+
+
+def test_feed_mixed_types() -> None:
+    _, state = TOKENIZER.feed("ab")
+    with pytest.raises(CrossandraValueError):
+        TOKENIZER.feed(b"cd", state)
+
+
+def test_stream_state_pickle() -> None:
+    _, state = TOKENIZER.feed("x = 12")
+    assert pickle.loads(pickle.dumps(state)) == state  # noqa: S301
+
+
+async def read_all(data: bytes, **kwargs: Any) -> list[Any]:
+    reader = asyncio.StreamReader()
+    for chunk in chunked(data, 3):
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    return [tok async for tok in TOKENIZER.atokenize(reader, chunk_size=4, **kwargs)]
+
+
+def test_atokenize() -> None:
+    source = SOURCE.encode()
+    assert asyncio.run(
+        read_all(source, decode=True, with_positions=True)
+    ) == TOKENIZER.tokenize(source, decode=True, with_positions=True)
+
+
+def test_atokenize_executor() -> None:
+    source = SOURCE.encode()
+    with ThreadPoolExecutor(1) as executor:
+        assert asyncio.run(
+            read_all(source, decode=True, executor=executor)
+        ) == TOKENIZER.tokenize(source, decode=True)
+
+
+def test_feed_error_offset() -> None:
+    _, state = TOKENIZER.feed("x = 1\n")
+    with pytest.raises(CrossandraTokenizationError) as e:
+        TOKENIZER.feed("y $", state, final=True)
+    assert e.value.offset == len("x = 1\ny ")
+
+
+def follow(
+    path: Path, state: FollowState | None = None
+) -> tuple[list[Any], FollowState]:
+    reads = list(TOKENIZER.follow(path, state, chunk_size=4, timeout=0))
+    tokens = [token for new, _ in reads for token in new]
+    return tokens, reads[-1][1] if reads else state or FollowState()
+
+
+def test_follow(tmp_path: Path) -> None:
+    log = tmp_path / "app.log"
+    log.write_bytes(b"x = 1\ny = 2")
+    tokens, state = follow(log)
+    assert tokens == [b"x", Op.ASSIGN, 1]
+    assert state == FollowState(11, StreamState(5, b"\ny = 2"))
+
+    with log.open("ab") as f:
+        f.write(b"3\r\nz = 4\r\n")
+    tokens, state = follow(log, pickle.loads(pickle.dumps(state)))  # noqa: S301
+    assert tokens == [b"y", Op.ASSIGN, 23, b"z", Op.ASSIGN, 4]
+    assert state.position == log.stat().st_size
+    assert follow(log, state) == ([], state)
+
+
+def test_follow_unknown(tmp_path: Path) -> None:
+    log = tmp_path / "app.log"
+    log.write_bytes(b"a ! b\nc\n")
+    t = Crossandra(rules=[common.WORD], ignore_whitespace=True, suppress_unknown=True)
+    reads = list(t.follow(log, chunk_size=4, decode=True, timeout=0))
+    assert [token for tokens, _ in reads for token in tokens] == ["a", "b", "c"]
+
+
+def test_follow_truncated(tmp_path: Path) -> None:
+    log = tmp_path / "app.log"
+    log.write_bytes(b"x = 1\ny = 2\n")
+    _, state = follow(log)
+    log.write_bytes(b"z\n")
+    assert follow(log, state) == ([b"z"], FollowState(2, StreamState(1, b"\n")))
+
+
+def test_follow_rotated(tmp_path: Path) -> None:
+    log = tmp_path / "app.log"
+    log.write_bytes(b"a = 1\nb")
+    following = TOKENIZER.follow(log, interval=0.01, timeout=0.1)
+    assert next(following)[0] == [b"a", Op.ASSIGN, 1]
+    (tmp_path / "new.log").write_bytes(b"c\nd")
+    (tmp_path / "new.log").replace(log)
+    # The unfinished line of the old file is flushed
+    assert next(following) == ([b"b"], FollowState())
+    assert [tokens for tokens, _ in following] == [[b"c"]]
+
+
+def test_follow_closes_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    opened: list[IO[Any]] = []
+    path_open = Path.open
+
+    def tracking_open(self: Path, *args: Any, **kwargs: Any) -> IO[Any]:
+        f: IO[Any] = path_open(self, *args, **kwargs)
+        opened.append(f)
+        return f
+
+    monkeypatch.setattr(Path, "open", tracking_open)
+    log = tmp_path / "app.log"
+    log.write_bytes(b"a = 1\nb")
+    following = TOKENIZER.follow(log, interval=0.01, timeout=0.1)
+    assert next(following)[0] == [b"a", Op.ASSIGN, 1]
+    # Open files can't be replaced on Windows
+    assert opened
+    assert all(f.closed for f in opened)
+
+
+def read(
+    path: Path, state: FollowState | None = None, **kwargs: Any
+) -> tuple[list[Any], FollowState]:
+    reads = list(
+        TOKENIZER.tokenize_file(
+            path, state, chunk_size=4, decode=True, with_positions=True, **kwargs
+        )
+    )
+    tokens = [token for new, _ in reads for token in new]
+    return tokens, reads[-1][1] if reads else state or FollowState()
+
+
+def test_tokenize_file(tmp_path: Path) -> None:
+    path = tmp_path / "source.txt"
+    path.write_bytes(SOURCE.encode())
+    expected = TOKENIZER.tokenize(SOURCE.encode(), decode=True, with_positions=True)
+    tokens, state = read(path)
+    assert tokens == expected
+    assert state == FollowState(len(SOURCE), StreamState(len(SOURCE) - 1, b""))
+    # The final state is already flushed
+    assert read(path, state) == ([], state)
+
+
+@pytest.mark.parametrize("stop", range(len(SOURCE) + 1))
+def test_tokenize_file_resume(tmp_path: Path, stop: int) -> None:
+    path = tmp_path / "source.txt"
+    path.write_bytes(SOURCE.encode())
+    first, state = read(path, stop=stop)
+    assert state.position == stop
+    # Resumed by another worker, e.g. after a retry
+    worker = Crossandra(
+        Op, rules=[common.NUMBER, common.C_NAME, common.STRING], ignore_whitespace=True
+    )
+    rest = list(
+        worker.tokenize_file(
+            path,
+            pickle.loads(pickle.dumps(state)),  # noqa: S301
+            decode=True,
+            with_positions=True,
+        )
+    )
+    assert first + [t for new, _ in rest for t in new] == TOKENIZER.tokenize(
+        SOURCE.encode(), decode=True, with_positions=True
+    )
+
+
+def test_tokenize_file_max_buffer(tmp_path: Path) -> None:
+    path = tmp_path / "source.txt"
+    path.write_bytes(b"abcdefgh abcdefgh")
+    assert read(path)[0] == [(0, "abcdefgh"), (9, "abcdefgh")]
+    # Past max_buffer bytes without a newline, tokens are split at reads
+    assert read(path, max_buffer=4)[0] == [
+        (0, "abcdefgh"),
+        (9, "abcdefg"),
+        (16, "h"),
+    ]
+
+
+def test_tokenize_file_stop_reached(tmp_path: Path) -> None:
+    path = tmp_path / "source.txt"
+    path.write_bytes(b"x = 1\ny")
+    assert read(path, FollowState(3), stop=2) == ([], FollowState(3))
+    tokens, state = read(path, stop=7)
+    assert tokens == [(0, "x"), (2, Op.ASSIGN), (4, 1)]
+    assert state == FollowState(7, StreamState(5, b"\ny"))
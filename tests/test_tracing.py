@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from crossandra import (
+    Crossandra,
+    CrossandraTokenizationError,
+    CrossandraValueError,
+    common,
+    get_tracer,
+    set_tracer,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from crossandra.lib import Kind
+
+
+class Op(Enum):
+    ADD = "+"
+    SUB = "-"
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.events: list[tuple[Any, ...]] = []
+
+    def start(self, tokenizer: Crossandra, size: int, /) -> None:
+        self.events.append(("start", tokenizer, size))
+
+    def end(
+        self, tokenizer: Crossandra, size: int, count: int, elapsed: float, /
+    ) -> None:
+        assert elapsed >= 0
+        self.events.append(("end", tokenizer, size, count))
+
+    def token(
+        self,
+        tokenizer: Crossandra,
+        kind: Kind,
+        start: int,
+        length: int,
+        elapsed: float,
+        /,
+    ) -> None:
+        assert elapsed >= 0
+        self.events.append(("token", tokenizer, kind, start, length))
+
+
+@pytest.fixture
+def recorder() -> Iterator[Recorder]:
+    recorder = Recorder()
+    yield recorder
+    set_tracer(None)
+
+
+def test_start_end(recorder: Recorder) -> None:
+    t = Crossandra(Op, rules=[common.INT], ignore_whitespace=True)
+    set_tracer(recorder)
+    assert get_tracer() is recorder
+    assert t.tokenize("1 + 23") == [1, Op.ADD, 23]
+    assert t.tokenize(memoryview(b"ab-").cast("B")[2:]) == [Op.SUB]
+    assert t.tokenize_lines("1\n-") == [[1], [Op.SUB]]
+    assert recorder.events == [
+        ("start", t, 6),
+        ("end", t, 6, 3),
+        ("start", t, 1),
+        ("end", t, 1, 1),
+        ("start", t, 1),
+        ("end", t, 1, 1),
+        ("start", t, 1),
+        ("end", t, 1, 1),
+    ]
+
+
+@pytest.mark.parametrize("source", ["+ - + -- +", b"+ - + -- +"])
+def test_sampling_fast(recorder: Recorder, source: str | bytes) -> None:
+    t = Crossandra(Op, ignore_whitespace=True)
+    expected = t.tokenize(source, with_positions=True)
+    set_tracer(recorder, sample_every=2)
+    assert t.tokenize(source, with_positions=True) == expected
+    assert recorder.events == [
+        ("start", t, 10),
+        ("token", t, Op.SUB, 2, 1),
+        ("token", t, Op.SUB, 6, 1),
+        ("token", t, Op.ADD, 9, 1),
+        ("end", t, 10, 6),
+    ]
+
+
+def test_sampling_rules(recorder: Recorder) -> None:
+    t = Crossandra(Op, rules=[common.INT, common.C_NAME], ignore_whitespace=True)
+    set_tracer(recorder, sample_every=1)
+    assert t.tokenize("x - 10", exclude=[Op.SUB]) == ["x", 10]
+    assert recorder.events[1:3] == [
+        ("token", t, common.C_NAME, 0, 1),
+        ("token", t, common.INT, 4, 2),
+    ]
+
+
+def test_uninstall(recorder: Recorder) -> None:
+    t = Crossandra(Op)
+    set_tracer(recorder, sample_every=1)
+    set_tracer(None)
+    assert get_tracer() is None
+    assert t.tokenize("+-") == [Op.ADD, Op.SUB]
+    assert recorder.events == []
+
+
+def test_failure(recorder: Recorder) -> None:
+    set_tracer(recorder)
+    t = Crossandra(Op)
+    with pytest.raises(CrossandraTokenizationError):
+        t.tokenize("+*")
+    assert recorder.events == [("start", t, 2), ("end", t, 2, -1)]
+
+
+def test_invalid_sampling(recorder: Recorder) -> None:
+    with pytest.raises(CrossandraValueError, match="sample_every"):
+        set_tracer(recorder, sample_every=-1)
+    assert get_tracer() is None